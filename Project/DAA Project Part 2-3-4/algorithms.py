@@ -1,7 +1,99 @@
 import math
+import random
 import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from functools import lru_cache
+from operator import itemgetter
+
+from point_array import PointArray
+
+#numpy is optional here, the array backends are only used when it is installed
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
 
 class DivideConquerAlgorithms:
+    #inputs at least this large are sent to the numpy closest pair backend
+    #(it overtakes the pure python recursion at a few hundred points)
+    NUMPY_THRESHOLD = 1000
+    #ranges this small are solved with one pairwise distance block
+    NUMPY_BLOCK_SIZE = 32
+    #ranges this small are solved by brute force in the pure python recursion, fewer
+    #recursive calls and merges outweigh the extra distance checks
+    LEAF_SIZE = 12
+    #integer coordinate spans from here on could overflow int64 squared distances,
+    #such inputs are solved by the pure python recursion instead
+    NUMPY_MAX_SPAN = 1 << 31
+    #engines accepted by closest_pair(points, strategy=...)
+    CLOSEST_PAIR_STRATEGIES = ("auto", "divide_conquer", "numpy", "grid", "brute_force")
+    #leaves of the all_nearest_neighbors 2-d tree hold at most this many points
+    KD_LEAF_SIZE = 8
+    #parallel closest pair never hands a worker a slab smaller than this
+    PARALLEL_MIN_SLAB = 10000
+    #operands at or below this many bits use the builtin multiply in karatsuba_multiply_binary
+    #(below ~8k bits the python-level recursion costs more than it saves)
+    KARATSUBA_BIT_THRESHOLD = 8192
+    #operands at or below this many bits leave toom3_multiply for karatsuba_multiply_binary
+    TOOM3_BIT_THRESHOLD = 24576
+    #auto_multiply crossovers in bits, measured with calibrate_multiply_thresholds()
+    #(re-run it to tune them for another host, equal values mean an engine never won)
+    AUTO_KARATSUBA_BITS = 32768
+    AUTO_TOOM3_BITS = 32768
+    AUTO_FFT_BITS = 65536
+    #entries kept by each of the base_power / low_mask LRU caches
+    POWER_CACHE_SIZE = 512
+    #method names accepted by multiply_batch / get_multiplier
+    MULTIPLY_METHODS = {
+        "auto": "auto_multiply",
+        "standard": "standard_multiply",
+        "karatsuba": "karatsuba_multiply",
+        "karatsuba_binary": "karatsuba_multiply_binary",
+        "toom3": "toom3_multiply",
+        "fft": "fft_multiply",
+        "schoolbook": "schoolbook_multiply",
+        "naive": "naive_python_multiply",
+    }
+    
+    @staticmethod
+    def coordinate_lists(points):
+        #(xs, ys) as lists of python numbers for a list of (x, y) pairs, an (N, 2) array
+        #or a PointArray, without building a tuple per point
+        if isinstance(points, PointArray):
+            return points.tolists()
+        if NUMPY_AVAILABLE and isinstance(points, np.ndarray):
+            if len(points) == 0:
+                return [], []
+            return points[:, 0].tolist(), points[:, 1].tolist()
+        return [p[0] for p in points], [p[1] for p in points]
+    
+    @staticmethod
+    def sorted_columns(points):
+        #(sorted_points, px, py): the points sorted by x (stable) and their coordinates in
+        #that order, for the same inputs as coordinate_lists
+        #sorted_points[i] is the point returned in results: the caller's own element for
+        #lists, an (x, y) tuple of python numbers for arrays and PointArray
+        #px/py are lists for lists of points, and compact array('q') / array('d') columns
+        #for arrays and PointArray (see PointArray.take), so those never become lists
+        if NUMPY_AVAILABLE and isinstance(points, np.ndarray):
+            points = PointArray(points[:, 0], points[:, 1]) if len(points) else PointArray.from_points([])
+        if isinstance(points, PointArray):
+            px, py = points.take(points.x_order())
+            return PointArray(px, py), px, py
+        sorted_points = sorted(points, key=itemgetter(0))
+        return sorted_points, [p[0] for p in sorted_points], [p[1] for p in sorted_points]
+    
+    @staticmethod
+    def point_at(points, i):
+        #point i as returned in results: the caller's own element for lists, an (x, y)
+        #tuple of python numbers for arrays and PointArray
+        if NUMPY_AVAILABLE and isinstance(points, np.ndarray):
+            return tuple(points[i].tolist())
+        return points[i]
+    
     @staticmethod
     def closest_pair_brute_force(points):
         #brute force method for closest pair (for small inputs)
@@ -18,47 +110,695 @@ class DivideConquerAlgorithms:
         return min_dist, pair
     
     @staticmethod
-    def closest_pair(points):
+    def closest_pair(points, strategy="auto", workers=1, stats=None):
         #divide and conquer algorithm for closest pair of points
-
-        # Sort points by x-coordinate
-        points_sorted = sorted(points, key=lambda p: p[0])
+        #sorts by x once and recurses on index ranges, so the point list is never sliced,
+        #y-order is merged bottom-up (O(n log n)) and the strip is found by binary search
+        #on the sorted x column (see closest_pair_combine)
+        #strategy picks another engine with the same return value, "auto" uses
+        #the numpy backend for arrays and large inputs when it is installed
+        #workers > 1 runs the divide and conquer engine across processes
+        #points may be a list of (x, y) pairs, an (N, 2) numpy array or a PointArray
+        #stats (an instrumentation.AlgorithmStats) runs the counted divide and conquer
+        #engine instead, serially, "auto" included
+        if strategy not in DivideConquerAlgorithms.CLOSEST_PAIR_STRATEGIES:
+            raise ValueError(f"Unknown closest pair strategy: {strategy}")
+        if stats is not None:
+            if strategy not in ("auto", "divide_conquer"):
+                raise ValueError("Operation counters are only collected by the divide_conquer strategy")
+            strategy = "divide_conquer"
+            workers = 1
+        if workers > 1 and strategy in ("auto", "divide_conquer"):
+            return DivideConquerAlgorithms.closest_pair_parallel(points, workers)
+        if strategy == "auto":
+            if NUMPY_AVAILABLE and (isinstance(points, np.ndarray) or
+                                    len(points) >= DivideConquerAlgorithms.NUMPY_THRESHOLD):
+                strategy = "numpy"
+            else:
+                strategy = "divide_conquer"
+        if strategy == "numpy":
+            return DivideConquerAlgorithms.closest_pair_numpy(points)
+        if strategy == "grid":
+            return DivideConquerAlgorithms.closest_pair_grid(points)
+        if strategy == "brute_force":
+            #the O(n^2) loop indexes points directly, so arrays are turned into tuples once
+            if NUMPY_AVAILABLE and isinstance(points, np.ndarray):
+                points = [tuple(p) for p in points.tolist()]
+            elif isinstance(points, PointArray):
+                points = list(points)
+            return DivideConquerAlgorithms.closest_pair_brute_force(points)
         
-        def closest_pair_recursive(P):
-            n = len(P)
-            if n <= 3:
-                return DivideConquerAlgorithms.closest_pair_brute_force(P)
+        n = len(points)
+        if n < 2:
+            return float('inf'), None
+        
+        #sort points by x-coordinate
+        sorted_points, px, py = DivideConquerAlgorithms.sorted_columns(points)
+        
+        #ybuf holds positions of px/py, left y-sorted within each solved range
+        ybuf = list(range(n))
+        if stats is not None:
+            stats.count("points", n)
+            best_d2, i, j = DivideConquerAlgorithms.closest_pair_recursive_counted(px, py, 0, n, ybuf, stats, 0)
+        else:
+            best_d2, i, j = DivideConquerAlgorithms.closest_pair_recursive(px, py, 0, n, ybuf)
+        return math.sqrt(best_d2), (sorted_points[i], sorted_points[j])
+    
+    @staticmethod
+    def closest_pair_recursive(px, py, lo, hi, ybuf):
+        #solves the x-sorted range [lo, hi) of px/py using squared distances
+        #returns (squared distance, i, j) with i/j as positions in px/py
+        #on return ybuf[lo:hi] holds the positions lo..hi-1 sorted by y
+        n = hi - lo
+        if n <= DivideConquerAlgorithms.LEAF_SIZE:
+            best_d2 = float('inf')
+            best_i = best_j = lo
+            for i in range(lo, hi):
+                x0, y0 = px[i], py[i]
+                for j in range(i + 1, hi):
+                    dx = px[j] - x0
+                    dy = py[j] - y0
+                    d2 = dx * dx + dy * dy
+                    if d2 < best_d2:
+                        best_d2, best_i, best_j = d2, i, j
+            ybuf[lo:hi] = sorted(range(lo, hi), key=py.__getitem__)
+            return best_d2, best_i, best_j
+        
+        #divide
+        mid = (lo + hi) // 2
+        #conquer
+        left = DivideConquerAlgorithms.closest_pair_recursive(px, py, lo, mid, ybuf)
+        right = DivideConquerAlgorithms.closest_pair_recursive(px, py, mid, hi, ybuf)
+        #combine
+        return DivideConquerAlgorithms.closest_pair_combine(px, py, lo, mid, hi, ybuf, left, right)
+    
+    @staticmethod
+    def strip_reach(best_d2):
+        #largest |dx| that can still give a squared distance below best_d2
+        #(exact for integer coordinates, slightly widened against rounding for floats)
+        if isinstance(best_d2, int):
+            return math.isqrt(best_d2 - 1)
+        return math.sqrt(best_d2) * (1 + 1e-9)
+    
+    @staticmethod
+    def merge_by_y(py, lo, hi, ybuf):
+        #merges the y-sorted halves of ybuf[lo:hi] in place, returns the merged range
+        #the halves are two ascending runs, which sorted() (Timsort) detects and merges
+        #in one linear pass, so this is the O(n) merge step, not a re-sort
+        window = sorted(ybuf[lo:hi], key=py.__getitem__)
+        ybuf[lo:hi] = window
+        return window
+    
+    @staticmethod
+    def strip_sides(px, lo, mid, hi, window, bound):
+        #(left, right) strip around px[mid] for a squared distance bound, each side in the
+        #y order of window (the merged ybuf[lo:hi]), None when a side is empty
+        #px is sorted, so the strip is the position range [a, b) found by binary search,
+        #and filtering window by position keeps the y order without sorting
+        if bound == 0:
+            return None
+        mid_x = px[mid]
+        reach = DivideConquerAlgorithms.strip_reach(bound)
+        a = bisect_left(px, mid_x - reach, lo, mid)
+        b = bisect_right(px, mid_x + reach, mid, hi)
+        if a == mid or b == mid:
+            return None
+        if a != lo or b != hi:
+            window = [p for p in window if a <= p < b]
+        return [p for p in window if p < mid], [p for p in window if p >= mid]
+    
+    @staticmethod
+    def closest_pair_combine(px, py, lo, mid, hi, ybuf, left, right):
+        #combine step for the solved ranges [lo, mid) and [mid, hi)
+        #left/right are their (squared distance, i, j) results, ybuf[lo:mid] and
+        #ybuf[mid:hi] their y orders, merged here into the y order of [lo, hi)
+        dist_left, li, lj = left
+        dist_right, ri, rj = right
+        if dist_left < dist_right:
+            best_d2, best_i, best_j = dist_left, li, lj
+        else:
+            best_d2, best_i, best_j = dist_right, ri, rj
+        
+        #merge the y-sorted halves (see merge_by_y, inlined on this hot path)
+        window = sorted(ybuf[lo:hi], key=py.__getitem__)
+        ybuf[lo:hi] = window
+        strip = DivideConquerAlgorithms.strip_sides(px, lo, mid, hi, window, best_d2)
+        
+        #pairs within one side were solved by the recursion, so each left strip point is
+        #only checked against the right strip points within best distance in y
+        #(both sides sorted by y, the window start only moves up)
+        if strip is None:
+            return best_d2, best_i, best_j
+        left_strip, right_strip = strip
+        m = len(right_strip)
+        start = 0
+        for p in left_strip:
+            x0, y0 = px[p], py[p]
+            while start < m:
+                dy = y0 - py[right_strip[start]]
+                if dy <= 0 or dy * dy < best_d2:
+                    break
+                start += 1
+            for t in range(start, m):
+                q = right_strip[t]
+                dy = py[q] - y0
+                if dy > 0 and dy * dy >= best_d2:
+                    break
+                dx = px[q] - x0
+                d2 = dx * dx + dy * dy
+                if d2 < best_d2:
+                    best_d2, best_i, best_j = d2, p, q
+        
+        return best_d2, best_i, best_j
+    
+    @staticmethod
+    def closest_pair_recursive_counted(px, py, lo, hi, ybuf, stats, depth):
+        #closest_pair_recursive that also fills an AlgorithmStats, only used when
+        #closest_pair is called with stats (the plain recursion stays uninstrumented)
+        stats.count("recursive_calls")
+        stats.maximum("max_depth", depth)
+        n = hi - lo
+        if n <= DivideConquerAlgorithms.LEAF_SIZE:
+            stats.count("base_cases")
+            stats.count("distance_evaluations", n * (n - 1) // 2)
+            return DivideConquerAlgorithms.closest_pair_recursive(px, py, lo, hi, ybuf)
+        
+        mid = (lo + hi) // 2
+        left = DivideConquerAlgorithms.closest_pair_recursive_counted(px, py, lo, mid, ybuf, stats, depth + 1)
+        right = DivideConquerAlgorithms.closest_pair_recursive_counted(px, py, mid, hi, ybuf, stats, depth + 1)
+        
+        #closest_pair_combine, counting the strip and its comparisons
+        best_d2, best_i, best_j = left if left[0] < right[0] else right
+        window = DivideConquerAlgorithms.merge_by_y(py, lo, hi, ybuf)
+        strip = DivideConquerAlgorithms.strip_sides(px, lo, mid, hi, window, best_d2)
+        
+        evaluations = 0
+        strip_size = 0
+        if strip is not None:
+            left_strip, right_strip = strip
+            m = len(right_strip)
+            strip_size = len(left_strip) + m
+            start = 0
+            for p in left_strip:
+                x0, y0 = px[p], py[p]
+                while start < m:
+                    dy = y0 - py[right_strip[start]]
+                    if dy <= 0 or dy * dy < best_d2:
+                        break
+                    start += 1
+                for t in range(start, m):
+                    q = right_strip[t]
+                    dy = py[q] - y0
+                    if dy > 0 and dy * dy >= best_d2:
+                        break
+                    evaluations += 1
+                    dx = px[q] - x0
+                    d2 = dx * dx + dy * dy
+                    if d2 < best_d2:
+                        best_d2, best_i, best_j = d2, p, q
+        
+        #a strip close to the range size means the split line does not separate the points
+        stats.record("range_size", depth, n)
+        stats.record("strip_size", depth, strip_size)
+        stats.record("strip_comparisons", depth, evaluations)
+        stats.count("strip_points", strip_size)
+        stats.count("distance_evaluations", evaluations)
+        return best_d2, best_i, best_j
+    
+    @staticmethod
+    def closest_pair_parallel(points, workers):
+        #multi-process divide and conquer, gives exactly the serial closest_pair result
+        #the x-sorted coordinates go into shared memory and each worker solves one
+        #node of the serial recursion tree (a vertical slab), the parent then runs
+        #the same combine steps above those nodes, so every comparison is identical
+        #(process pool and shared memory modules are imported here, they are slow to load)
+        from concurrent.futures import ProcessPoolExecutor
+        from multiprocessing import shared_memory
+        n = len(points)
+        if n < 2:
+            return float('inf'), None
+        
+        sorted_points, px, py = DivideConquerAlgorithms.sorted_columns(points)
+        
+        #coordinates must fit a fixed-width typecode to be shared without changing values
+        if isinstance(px, array) and isinstance(py, array):
+            #compact PointArray columns (see PointArray.take), mixed int/float stays serial
+            typecode = px.typecode if px.typecode == py.typecode else None
+        elif all(type(v) is int and -2**63 <= v < 2**63 for v in px + py):
+            typecode = 'q'
+        elif all(type(v) is float for v in px + py):
+            typecode = 'd'
+        else:
+            typecode = None
+        
+        #split as deep as the serial recursion would, one slab per node at that depth
+        depth = 0
+        while (1 << depth) < workers and (n >> (depth + 1)) >= DivideConquerAlgorithms.PARALLEL_MIN_SLAB:
+            depth += 1
+        
+        ybuf = list(range(n))
+        if depth == 0 or typecode is None:
+            best_d2, i, j = DivideConquerAlgorithms.closest_pair_recursive(px, py, 0, n, ybuf)
+            return math.sqrt(best_d2), (sorted_points[i], sorted_points[j])
+        
+        slabs = []
+        def collect(lo, hi, level):
+            if level == depth:
+                slabs.append((lo, hi))
+                return
+            mid = (lo + hi) // 2
+            collect(lo, mid, level + 1)
+            collect(mid, hi, level + 1)
+        collect(0, n, 0)
+        
+        blocks = []
+        try:
+            #x and y columns, then the block the workers write their slabs' y order into
+            for typ, values in ((typecode, px), (typecode, py), ('q', None)):
+                shm = shared_memory.SharedMemory(create=True, size=max(n * 8, 1))
+                blocks.append(shm)
+                if values is not None:
+                    view = shm.buf.cast(typ)
+                    #the segment can be rounded up to a whole page (Windows, macOS), so only
+                    #its first n items hold the coordinates
+                    view[:n] = array(typ, values)
+                    view.release()
+            names = tuple(shm.name for shm in blocks)
+            
+            with ProcessPoolExecutor(max_workers=min(workers, len(slabs))) as executor:
+                futures = [executor.submit(DivideConquerAlgorithms.closest_pair_slab,
+                                           names, typecode, n, lo, hi)
+                           for lo, hi in slabs]
+                leaves = {slab: future.result() for slab, future in zip(slabs, futures)}
+            
+            view = blocks[2].buf.cast('q')
+            ybuf = view[:n].tolist()
+            view.release()
+        finally:
+            for shm in blocks:
+                shm.close()
+                shm.unlink()
+    
+        def combine_up(lo, hi, level):
+            if level == depth:
+                return leaves[(lo, hi)]
+            mid = (lo + hi) // 2
+            left = combine_up(lo, mid, level + 1)
+            right = combine_up(mid, hi, level + 1)
+            return DivideConquerAlgorithms.closest_pair_combine(px, py, lo, mid, hi, ybuf, left, right)
+        
+        best_d2, i, j = combine_up(0, n, 0)
+        return math.sqrt(best_d2), (sorted_points[i], sorted_points[j])
+    
+    @staticmethod
+    def closest_pair_slab(names, typecode, n, lo, hi):
+        #worker side of closest_pair_parallel: solves slab [lo, hi) from shared memory
+        #holding n coordinates per column (the segments may be larger, see the parent)
+        #and writes its y order back into the shared ybuf block
+        from multiprocessing import shared_memory
+        blocks = [shared_memory.SharedMemory(name=name) for name in names]
+        try:
+            xs_view = blocks[0].buf.cast(typecode)
+            ys_view = blocks[1].buf.cast(typecode)
+            px = xs_view[:n][lo:hi].tolist()
+            py = ys_view[:n][lo:hi].tolist()
+            xs_view.release()
+            ys_view.release()
             
-            #divide
-            mid = n // 2
-            Q = P[:mid]
-            R = P[mid:]
-            #conquer
-            dist_left, pair_left = closest_pair_recursive(Q)
-            dist_right, pair_right = closest_pair_recursive(R)
-            #combine
-            min_dist = min(dist_left, dist_right)
-            best_pair = pair_left if dist_left < dist_right else pair_right
+            m = hi - lo
+            ybuf = list(range(m))
+            best_d2, i, j = DivideConquerAlgorithms.closest_pair_recursive(px, py, 0, m, ybuf)
             
-            #finding pts close to the vertical line
-            mid_x = P[mid][0]
-            strip = [p for p in P if abs(p[0] - mid_x) < min_dist]
-            strip.sort(key=lambda p: p[1])
+            out_view = blocks[2].buf.cast('q')
+            out_view[lo:hi] = array('q', [p + lo for p in ybuf])
+            out_view.release()
+        finally:
+            for shm in blocks:
+                shm.close()
+        return best_d2, i + lo, j + lo
+    
+    @staticmethod
+    def closest_pair_numpy(points):
+        #closest pair on an (N, 2) int/float array or a PointArray, same contract as closest_pair
+        #base cases and strip checks are vectorized, distances stay squared until the end
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for closest_pair_numpy")
+        if isinstance(points, PointArray):
+            xs, ys = points.numpy_columns()
+        else:
+            arr = np.asarray(points)
+            if arr.size == 0:
+                return float('inf'), None
+            if arr.ndim != 2 or arr.shape[1] != 2:
+                raise ValueError("closest_pair_numpy expects an (N, 2) array of points")
+            xs, ys = arr[:, 0], arr[:, 1]
+        n = len(xs)
+        if n < 2:
+            return float('inf'), None
+        
+        #integers stay exact in int64 while dx*dx + dy*dy fits, i.e. both coordinate spans
+        #are below 2^31; wider or arbitrary precision (object) integers go to the pure
+        #python divide and conquer, which squares them exactly
+        integral = xs.dtype.kind in 'biu' and ys.dtype.kind in 'biu'
+        if integral:
+            span = max(int(xs.max()) - int(xs.min()), int(ys.max()) - int(ys.min()))
+            if span >= DivideConquerAlgorithms.NUMPY_MAX_SPAN:
+                return DivideConquerAlgorithms.closest_pair(points, strategy="divide_conquer")
+        elif xs.dtype.kind == 'O' or ys.dtype.kind == 'O':
+            return DivideConquerAlgorithms.closest_pair(points, strategy="divide_conquer")
+        dtype = np.int64 if integral else np.float64
+        order = np.argsort(xs, kind='stable')
+        px = xs[order].astype(dtype, copy=False)
+        py = ys[order].astype(dtype, copy=False)
+        #positions in px/py ordered by y, split top-down instead of re-sorted
+        ys = np.argsort(py, kind='stable')
+        
+        best_d2, i, j = DivideConquerAlgorithms.closest_pair_numpy_recursive(px, py, 0, n, ys)
+        i, j = int(order[i]), int(order[j])
+        return math.sqrt(best_d2), (DivideConquerAlgorithms.point_at(points, i),
+                                    DivideConquerAlgorithms.point_at(points, j))
+    
+    @staticmethod
+    def closest_pair_numpy_recursive(px, py, lo, hi, ys):
+        #solves the x-sorted range [lo, hi), ys holds its positions sorted by y
+        #returns (squared distance, i, j) with i/j as positions in px/py
+        n = hi - lo
+        if n <= DivideConquerAlgorithms.NUMPY_BLOCK_SIZE:
+            x = px[lo:hi]
+            y = py[lo:hi]
+            a, b = np.triu_indices(n, 1)
+            dx = x[a] - x[b]
+            dy = y[a] - y[b]
+            d2 = dx * dx + dy * dy
+            k = int(np.argmin(d2))
+            return d2[k].item(), lo + int(a[k]), lo + int(b[k])
+        
+        #divide
+        mid = (lo + hi) // 2
+        mid_x = px[mid]
+        left = ys < mid
+        #conquer
+        dist_left, li, lj = DivideConquerAlgorithms.closest_pair_numpy_recursive(px, py, lo, mid, ys[left])
+        dist_right, ri, rj = DivideConquerAlgorithms.closest_pair_numpy_recursive(px, py, mid, hi, ys[~left])
+        #combine
+        if dist_left < dist_right:
+            best_d2, best_i, best_j = dist_left, li, lj
+        else:
+            best_d2, best_i, best_j = dist_right, ri, rj
+        
+        #strip around the vertical line, already in y order
+        dx = px[ys] - mid_x
+        strip = ys[dx * dx < best_d2]
+        m = len(strip)
+        if m < 2:
+            return best_d2, best_i, best_j
+        sx = px[strip]
+        sy = py[strip]
+        
+        #compare every strip point with the one k places above it, for growing k,
+        #until no pair is within best_d2 vertically
+        for k in range(1, m):
+            dy = sy[k:] - sy[:-k]
+            dy2 = dy * dy
+            if not (dy2 < best_d2).any():
+                break
+            dx = sx[k:] - sx[:-k]
+            d2 = dx * dx + dy2
+            t = int(np.argmin(d2))
+            if d2[t] < best_d2:
+                best_d2, best_i, best_j = d2[t].item(), int(strip[t]), int(strip[t + k])
+        
+        return best_d2, best_i, best_j
+    
+    @staticmethod
+    def closest_pair_grid(points, seed=None):
+        #randomized grid closest pair (Rabin / Khuller-Matias style), expected O(n)
+        #points are inserted in random order into a hash grid whose cell size is the
+        #current minimum distance, so only the 3x3 neighbouring cells need checking
+        #the grid is rebuilt whenever the minimum shrinks, and the search stops at 0
+        n = len(points)
+        if n < 2:
+            return float('inf'), None
+        xs, ys = DivideConquerAlgorithms.coordinate_lists(points)
+        
+        order = list(range(n))
+        random.Random(seed).shuffle(order)
+        #integer coordinates get exact integer cells, floats use float cells
+        integral = all(isinstance(v, int) for v in xs) and all(isinstance(v, int) for v in ys)
+    
+        def cell_size(d2):
+            if integral:
+                return math.isqrt(d2 - 1) + 1  #ceil(sqrt(d2))
+            #slightly widened so rounding can never push a neighbour two cells away
+            return math.sqrt(d2) * (1 + 1e-9)
+    
+        def build_grid(count, size):
+            grid = {}
+            for k in range(count):
+                i = order[k]
+                key = (xs[i] // size, ys[i] // size)
+                if key in grid:
+                    grid[key].append(order[k])
+                else:
+                    grid[key] = [order[k]]
+            return grid
+        
+        best_i, best_j = order[0], order[1]
+        best_d2 = (xs[best_i] - xs[best_j]) ** 2 + (ys[best_i] - ys[best_j]) ** 2
+        if best_d2 == 0:
+            return 0.0, (DivideConquerAlgorithms.point_at(points, best_i),
+                         DivideConquerAlgorithms.point_at(points, best_j))
+        size = cell_size(best_d2)
+        grid = build_grid(2, size)
+        
+        for k in range(2, n):
+            i = order[k]
+            x, y = xs[i], ys[i]
+            cx, cy = x // size, y // size
+            found_d2, found_j = best_d2, -1
+            for gx in (cx - 1, cx, cx + 1):
+                for gy in (cy - 1, cy, cy + 1):
+                    cell = grid.get((gx, gy))
+                    if cell is None:
+                        continue
+                    for j in cell:
+                        dx = xs[j] - x
+                        dy = ys[j] - y
+                        d2 = dx * dx + dy * dy
+                        if d2 < found_d2:
+                            found_d2, found_j = d2, j
             
-            #check points in strip
-            for i in range(len(strip)):
-                j = i + 1
-                while j < len(strip) and (strip[j][1] - strip[i][1]) < min_dist:
-                    dist = math.sqrt((strip[i][0] - strip[j][0])**2 + 
-                                   (strip[i][1] - strip[j][1])**2)
-                    if dist < min_dist:
-                        min_dist = dist
-                        best_pair = (strip[i], strip[j])
-                    j += 1
+            if found_j < 0:
+                key = (cx, cy)
+                if key in grid:
+                    grid[key].append(i)
+                else:
+                    grid[key] = [i]
+                continue
             
-            return min_dist, best_pair
+            #minimum shrank: record it, stop on duplicates, else rebuild the grid
+            best_d2, best_i, best_j = found_d2, found_j, i
+            if best_d2 == 0:
+                break
+            size = cell_size(best_d2)
+            grid = build_grid(k + 1, size)
         
-        return closest_pair_recursive(points_sorted)
+        return math.sqrt(best_d2), (DivideConquerAlgorithms.point_at(points, best_i),
+                                    DivideConquerAlgorithms.point_at(points, best_j))
+    
+    @staticmethod
+    def k_closest_pairs(points, k):
+        #the k closest pairs as [(distance, (p, q)), ...] in increasing distance
+        #same presorted divide and conquer as closest_pair, but the running minimum is a
+        #buffer of candidate pairs and the strip bound is the k-th best distance in it,
+        #so the strip only ever scans pairs that can still enter the top k (O(n log n + k))
+        n = len(points)
+        if n < 2 or k < 1:
+            return []
+        
+        sorted_points, px, py = DivideConquerAlgorithms.sorted_columns(points)
+        
+        #(squared distance, i, j) over positions in px/py
+        best = []
+        ybuf = list(range(n))
+        DivideConquerAlgorithms.k_closest_recursive(px, py, 0, n, ybuf, best, k, float('inf'))
+        best.sort()
+        return [(math.sqrt(d2), (sorted_points[i], sorted_points[j])) for d2, i, j in best[:k]]
+    
+    @staticmethod
+    def k_closest_prune(best, k):
+        #cuts the candidate buffer down to its k best pairs, returns the new bound
+        #(pruning only once the buffer holds 2k pairs keeps this O(1) per candidate
+        #instead of a heap operation with tuple comparisons for every accepted pair)
+        best.sort(key=itemgetter(0))
+        del best[k:]
+        return best[-1][0]
+    
+    @staticmethod
+    def k_closest_recursive(px, py, lo, hi, ybuf, best, k, bound):
+        #closest_pair_recursive with every candidate below bound appended to best
+        #bound is the k-th best squared distance seen so far (inf before k pairs), it only
+        #shrinks, so a pair at or beyond it can never enter the top k; returns the new bound
+        #ybuf[lo:hi] is left sorted by y as in closest_pair_recursive
+        n = hi - lo
+        if n <= 3:
+            for i in range(lo, hi):
+                x0, y0 = px[i], py[i]
+                for j in range(i + 1, hi):
+                    dx = px[j] - x0
+                    dy = py[j] - y0
+                    d2 = dx * dx + dy * dy
+                    if d2 < bound:
+                        best.append((d2, i, j))
+            ybuf[lo:hi] = sorted(range(lo, hi), key=py.__getitem__)
+            if len(best) >= 2 * k:
+                bound = DivideConquerAlgorithms.k_closest_prune(best, k)
+            return bound
+        
+        mid = (lo + hi) // 2
+        bound = DivideConquerAlgorithms.k_closest_recursive(px, py, lo, mid, ybuf, best, k, bound)
+        bound = DivideConquerAlgorithms.k_closest_recursive(px, py, mid, hi, ybuf, best, k, bound)
+        
+        #strip around the dividing line from the merged y order, like closest_pair_combine
+        window = DivideConquerAlgorithms.merge_by_y(py, lo, hi, ybuf)
+        strip = DivideConquerAlgorithms.strip_sides(px, lo, mid, hi, window, bound)
+        if strip is None:
+            return bound
+        
+        #pairs within one side were already offered by the recursion, so each left strip
+        #point only scans the y-sorted right strip, stopping once dy^2 reaches the bound
+        left_strip, right_strip = strip
+        m = len(right_strip)
+        limit = 2 * k
+        start = 0
+        for p in left_strip:
+            x0, y0 = px[p], py[p]
+            while start < m:
+                dy = y0 - py[right_strip[start]]
+                if dy <= 0 or dy * dy < bound:
+                    break
+                start += 1
+            for t in range(start, m):
+                q = right_strip[t]
+                dy = py[q] - y0
+                if dy > 0 and dy * dy >= bound:
+                    break
+                dx = px[q] - x0
+                d2 = dx * dx + dy * dy
+                if d2 < bound:
+                    best.append((d2, p, q))
+                    if len(best) >= limit:
+                        bound = DivideConquerAlgorithms.k_closest_prune(best, k)
+        return bound
+    
+    @staticmethod
+    def all_nearest_neighbors(points):
+        #nearest other point of every point as [(distance, index), ...] in input order,
+        #(inf, None) when there is no other point
+        #spatial index: a 2-d tree built by median splits over an index permutation,
+        #each query walks it depth first and skips nodes whose bounding box is beyond
+        #the best distance; nodes split on their wider axis and are pruned by box
+        #distance, so tied coordinates (collinear or gridded points) cannot force a
+        #query into both subtrees of a zero-width split, O(n log n) overall
+        n = len(points)
+        if n < 2:
+            return [(float('inf'), None)] * n
+        xs, ys = DivideConquerAlgorithms.coordinate_lists(points)
+        
+        #ranks order the points by (x, y) and (y, x), ties left in index order, so a run
+        #of equal coordinates is cut by the other axis instead of interleaving both halves
+        index = sorted(range(n), key=lambda j: (xs[j], ys[j]))
+        rank_x = [0] * n
+        for r, j in enumerate(index):
+            rank_x[j] = r
+        rank_y = [0] * n
+        for r, j in enumerate(sorted(range(n), key=lambda j: (ys[j], xs[j]))):
+            rank_y[j] = r
+        
+        #nodes: (lo, hi, axis, split, left, right, min_x, max_x, min_y, max_y),
+        #leaves have left == -1; index[lo:hi] is kept sorted by the sorted_axis rank
+        nodes = []
+        def build(lo, hi, sorted_axis):
+            node = len(nodes)
+            sub_x = list(map(xs.__getitem__, index[lo:hi]))
+            sub_y = list(map(ys.__getitem__, index[lo:hi]))
+            box = (min(sub_x), max(sub_x), min(sub_y), max(sub_y))
+            if hi - lo <= DivideConquerAlgorithms.KD_LEAF_SIZE:
+                nodes.append((lo, hi, 0, None, -1, -1) + box)
+                return node
+            axis = 0 if box[1] - box[0] >= box[3] - box[2] else 1
+            if axis != sorted_axis:
+                index[lo:hi] = sorted(index[lo:hi], key=(rank_x if axis == 0 else rank_y).__getitem__)
+            mid = (lo + hi) // 2
+            split = (xs if axis == 0 else ys)[index[mid]]
+            nodes.append(None)
+            left = build(lo, mid, axis)
+            right = build(mid, hi, axis)
+            nodes[node] = (lo, hi, axis, split, left, right) + box
+            return node
+        build(0, n, 0)
+        
+        result = []
+        for i in range(n):
+            x, y = xs[i], ys[i]
+            best_d2 = float('inf')
+            best_j = None
+            stack = [0]
+            while stack:
+                lo, hi, axis, split, left, right, min_x, max_x, min_y, max_y = nodes[stack.pop()]
+                #squared distance from (x, y) to the node's bounding box
+                dx = min_x - x if x < min_x else (x - max_x if x > max_x else 0)
+                dy = min_y - y if y < min_y else (y - max_y if y > max_y else 0)
+                if dx * dx + dy * dy >= best_d2:
+                    continue
+                if left < 0:
+                    for s in range(lo, hi):
+                        j = index[s]
+                        if j == i:
+                            continue
+                        dx = xs[j] - x
+                        dy = ys[j] - y
+                        d2 = dx * dx + dy * dy
+                        if d2 < best_d2:
+                            best_d2, best_j = d2, j
+                    continue
+                #far side first on the stack so the near side is searched first
+                if (x if axis == 0 else y) < split:
+                    stack.append(right)
+                    stack.append(left)
+                else:
+                    stack.append(left)
+                    stack.append(right)
+            result.append((math.sqrt(best_d2), best_j))
+        return result
+    
+    @staticmethod
+    @lru_cache(maxsize=POWER_CACHE_SIZE)
+    def base_power(base, exponent):
+        #base ** exponent, memoized for the split points of the recursive multipliers
+        return base ** exponent
+    
+    @staticmethod
+    @lru_cache(maxsize=POWER_CACHE_SIZE)
+    def low_mask(bits):
+        #(1 << bits) - 1, memoized for the binary limb multipliers
+        return (1 << bits) - 1
+    
+    @staticmethod
+    def power_cache_info():
+        #hit/miss counters of the shared power and mask caches
+        info = {}
+        for name, cached in (("base_power", DivideConquerAlgorithms.base_power),
+                             ("low_mask", DivideConquerAlgorithms.low_mask)):
+            stats = cached.cache_info()
+            info[name] = {"hits": stats.hits, "misses": stats.misses,
+                          "size": stats.currsize, "maxsize": stats.maxsize}
+        return info
+    
+    @staticmethod
+    def clear_power_cache():
+        DivideConquerAlgorithms.base_power.cache_clear()
+        DivideConquerAlgorithms.low_mask.cache_clear()
     
     @staticmethod
     def karatsuba_multiply(x, y):
@@ -73,8 +813,9 @@ class DivideConquerAlgorithms:
         m = n // 2
         
         #split the num(s)
-        high1, low1 = x // 10**m, x % 10**m
-        high2, low2 = y // 10**m, y % 10**m
+        power = DivideConquerAlgorithms.base_power(10, m)
+        high1, low1 = divmod(x, power)
+        high2, low2 = divmod(y, power)
         
         #recursive steps
         z0 = DivideConquerAlgorithms.karatsuba_multiply(low1, low2)
@@ -82,13 +823,238 @@ class DivideConquerAlgorithms:
         z2 = DivideConquerAlgorithms.karatsuba_multiply(high1, high2)
         
         #combining results
-        return z2 * 10**(2*m) + (z1 - z2 - z0) * 10**m + z0
+        return z2 * DivideConquerAlgorithms.base_power(10, 2 * m) + (z1 - z2 - z0) * power + z0
+    
+    @staticmethod
+    def karatsuba_multiply_counted(x, y, stats, depth=0):
+        #karatsuba_multiply that also fills an AlgorithmStats with node and base case
+        #counts and operand digit lengths per recursion level
+        stats.count("karatsuba_nodes")
+        stats.maximum("max_depth", depth)
+        if x < 10 or y < 10:
+            stats.count("base_cases")
+            stats.record("base_cases", depth, 1)
+            return x * y
+        
+        n = max(len(str(x)), len(str(y)))
+        m = n // 2
+        stats.record("digits", depth, n)
+        
+        power = DivideConquerAlgorithms.base_power(10, m)
+        high1, low1 = divmod(x, power)
+        high2, low2 = divmod(y, power)
+        
+        z0 = DivideConquerAlgorithms.karatsuba_multiply_counted(low1, low2, stats, depth + 1)
+        z1 = DivideConquerAlgorithms.karatsuba_multiply_counted((low1 + high1), (low2 + high2), stats, depth + 1)
+        z2 = DivideConquerAlgorithms.karatsuba_multiply_counted(high1, high2, stats, depth + 1)
+        
+        return z2 * DivideConquerAlgorithms.base_power(10, 2 * m) + (z1 - z2 - z0) * power + z0
+    
+    @staticmethod
+    def karatsuba_multiply_binary(x, y):
+        #karatsuba on binary limbs: splits with bit_length(), shifts and masks
+        #instead of len(str()) and powers of 10, so no base-10 conversion happens
+        if x < 0 or y < 0:
+            sign = -1 if (x < 0) != (y < 0) else 1
+            return sign * DivideConquerAlgorithms.karatsuba_multiply_binary(abs(x), abs(y))
+        
+        #base case, the builtin multiply wins on small operands
+        n = max(x.bit_length(), y.bit_length())
+        if n <= DivideConquerAlgorithms.KARATSUBA_BIT_THRESHOLD:
+            return x * y
+        
+        #split the num(s) at m bits
+        m = n // 2
+        mask = DivideConquerAlgorithms.low_mask(m)
+        high1, low1 = x >> m, x & mask
+        high2, low2 = y >> m, y & mask
+        
+        #recursive steps
+        z0 = DivideConquerAlgorithms.karatsuba_multiply_binary(low1, low2)
+        z1 = DivideConquerAlgorithms.karatsuba_multiply_binary(low1 + high1, low2 + high2)
+        z2 = DivideConquerAlgorithms.karatsuba_multiply_binary(high1, high2)
+        
+        #combining results
+        return (z2 << (2 * m)) + ((z1 - z2 - z0) << m) + z0
+    
+    @staticmethod
+    def toom3_multiply(x, y):
+        #toom-cook 3-way on binary limbs: 5 recursive products instead of 9
+        #evaluates at 0, 1, -1, -2 and infinity and interpolates with bodrato's sequence
+        if x < 0 or y < 0:
+            sign = -1 if (x < 0) != (y < 0) else 1
+            return sign * DivideConquerAlgorithms.toom3_multiply(abs(x), abs(y))
+        
+        #base case, hand smaller operands to binary karatsuba
+        n = max(x.bit_length(), y.bit_length())
+        if n <= DivideConquerAlgorithms.TOOM3_BIT_THRESHOLD:
+            return DivideConquerAlgorithms.karatsuba_multiply_binary(x, y)
+        
+        #split the num(s) into 3 limbs of k bits
+        k = (n + 2) // 3
+        mask = DivideConquerAlgorithms.low_mask(k)
+        x0, x1, x2 = x & mask, (x >> k) & mask, x >> (2 * k)
+        y0, y1, y2 = y & mask, (y >> k) & mask, y >> (2 * k)
+        
+        #evaluation
+        xt, yt = x0 + x2, y0 + y2
+        px1, py1 = xt + x1, yt + y1
+        pxm1, pym1 = xt - x1, yt - y1
+        pxm2, pym2 = ((pxm1 + x2) << 1) - x0, ((pym1 + y2) << 1) - y0
+        
+        #recursive steps
+        r0 = DivideConquerAlgorithms.toom3_multiply(x0, y0)
+        r1 = DivideConquerAlgorithms.toom3_multiply(px1, py1)
+        rm1 = DivideConquerAlgorithms.toom3_multiply(pxm1, pym1)
+        rm2 = DivideConquerAlgorithms.toom3_multiply(pxm2, pym2)
+        rinf = DivideConquerAlgorithms.toom3_multiply(x2, y2)
+        
+        #interpolation (all divisions are exact)
+        c3 = (rm2 - r1) // 3
+        c1 = (r1 - rm1) >> 1
+        c2 = rm1 - r0
+        c3 = ((c2 - c3) >> 1) + (rinf << 1)
+        c2 = c2 + c1 - rinf
+        c1 = c1 - c3
+        
+        #combining results
+        return r0 + (c1 << k) + (c2 << (2 * k)) + (c3 << (3 * k)) + (rinf << (4 * k))
+    
+    @staticmethod
+    def fft_multiply(x, y):
+        #floating point FFT multiplication with exact carry handling (needs numpy)
+        #operands become 16- or 8-bit limbs, the convolution is rounded back to
+        #integers (checked against rounding error) and carried through int.from_bytes
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for fft_multiply")
+        if x < 0 or y < 0:
+            sign = -1 if (x < 0) != (y < 0) else 1
+            return sign * DivideConquerAlgorithms.fft_multiply(abs(x), abs(y))
+        if x == 0 or y == 0:
+            return 0
+        
+        #the largest limb whose convolution stays well inside float64's 53 bits
+        nbits = max(x.bit_length(), y.bit_length())
+        for limb_bits in (16, 8):
+            if 2 * limb_bits + (nbits // limb_bits + 1).bit_length() <= 42:
+                break
+        else:
+            return DivideConquerAlgorithms.toom3_multiply(x, y)
+        
+        a = DivideConquerAlgorithms.int_to_limbs(x, limb_bits).astype(np.float64)
+        b = DivideConquerAlgorithms.int_to_limbs(y, limb_bits).astype(np.float64)
+        size = 1 << (len(a) + len(b) - 2).bit_length()
+        conv = np.fft.irfft(np.fft.rfft(a, size) * np.fft.rfft(b, size), size)[:len(a) + len(b) - 1]
+        coeffs = np.rint(conv)
+        if np.max(np.abs(conv - coeffs)) > 0.25:
+            #precision was lost, never return a wrong product
+            return DivideConquerAlgorithms.toom3_multiply(x, y)
+        return DivideConquerAlgorithms.limbs_to_int(coeffs.astype(np.int64), limb_bits)
+    
+    @staticmethod
+    def int_to_limbs(v, limb_bits):
+        #little-endian numpy array of 8- or 16-bit limbs of a non-negative int
+        limb_bytes = limb_bits // 8
+        nbytes = max(-(-v.bit_length() // limb_bits), 1) * limb_bytes
+        return np.frombuffer(v.to_bytes(nbytes, 'little'), dtype=f'<u{limb_bytes}')
+    
+    @staticmethod
+    def limbs_to_int(coeffs, limb_bits):
+        #sum of coeffs[i] << (i * limb_bits) for non-negative int64 coefficients of any size
+        #carry: cut every coefficient into limb-sized chunks and add them as whole numbers
+        dtype = f'<u{limb_bits // 8}'
+        coeffs = coeffs.copy()
+        result = 0
+        mask = (1 << limb_bits) - 1
+        shift = 0
+        while coeffs.any():
+            chunk = (coeffs & mask).astype(dtype)
+            result += int.from_bytes(chunk.tobytes(), 'little') << shift
+            coeffs >>= limb_bits
+            shift += limb_bits
+        return result
+    
+    @staticmethod
+    def auto_multiply(x, y):
+        #picks schoolbook (builtin), binary karatsuba, toom-3 or FFT by operand size
+        n = max(abs(x).bit_length(), abs(y).bit_length())
+        if n >= DivideConquerAlgorithms.AUTO_FFT_BITS and NUMPY_AVAILABLE:
+            return DivideConquerAlgorithms.fft_multiply(x, y)
+        if n >= DivideConquerAlgorithms.AUTO_TOOM3_BITS:
+            return DivideConquerAlgorithms.toom3_multiply(x, y)
+        if n >= DivideConquerAlgorithms.AUTO_KARATSUBA_BITS:
+            return DivideConquerAlgorithms.karatsuba_multiply_binary(x, y)
+        return DivideConquerAlgorithms.standard_multiply(x, y)
+    
+    @staticmethod
+    def calibrate_multiply_thresholds(max_bits=1 << 22, repeat=3):
+        #times every engine at doubling operand sizes on this host and stores the
+        #size at which each one first beats all cheaper engines in the AUTO_* attributes
+        engines = [DivideConquerAlgorithms.standard_multiply,
+                   DivideConquerAlgorithms.karatsuba_multiply_binary,
+                   DivideConquerAlgorithms.toom3_multiply]
+        if NUMPY_AVAILABLE:
+            engines.append(DivideConquerAlgorithms.fft_multiply)
+        
+        crossover = [0] + [float('inf')] * 3
+        bits = 1024
+        rng = random.Random(0)
+        while bits <= max_bits:
+            x, y = rng.getrandbits(bits) | (1 << (bits - 1)), rng.getrandbits(bits) | (1 << (bits - 1))
+            times = []
+            for engine in engines:
+                best = float('inf')
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    engine(x, y)
+                    best = min(best, time.perf_counter() - start)
+                times.append(best)
+            #a costlier engine has to win by a clear margin, not by timer noise
+            winner = times.index(min(times))
+            while winner > 0 and times[winner] > 0.9 * min(times[:winner]):
+                winner = times.index(min(times[:winner]))
+            for tier in range(1, winner + 1):
+                crossover[tier] = min(crossover[tier], bits)
+            bits *= 2
+        
+        #a faster engine can only take over after the cheaper ones
+        for tier in range(1, 4):
+            crossover[tier] = max(crossover[tier], crossover[tier - 1])
+        DivideConquerAlgorithms.AUTO_KARATSUBA_BITS = crossover[1]
+        DivideConquerAlgorithms.AUTO_TOOM3_BITS = crossover[2]
+        DivideConquerAlgorithms.AUTO_FFT_BITS = crossover[3]
+        return {"karatsuba": crossover[1], "toom3": crossover[2], "fft": crossover[3]}
     
     @staticmethod
     def standard_multiply(x, y):
         #standard multiplication for comparison
         return x * y
     
+    @staticmethod
+    def schoolbook_multiply(x, y):
+        #O(n^2) schoolbook multiplication on 16-bit limbs held in numpy arrays
+        #each row (one limb of the shorter number times the longer one) is a single
+        #vectorized multiply-add, carries are deferred until the very end
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for schoolbook_multiply")
+        if x < 0 or y < 0:
+            sign = -1 if (x < 0) != (y < 0) else 1
+            return sign * DivideConquerAlgorithms.schoolbook_multiply(abs(x), abs(y))
+        if x == 0 or y == 0:
+            return 0
+        
+        a = DivideConquerAlgorithms.int_to_limbs(x, 16).astype(np.int64)
+        b = DivideConquerAlgorithms.int_to_limbs(y, 16).astype(np.int64)
+        if len(a) < len(b):
+            a, b = b, a
+        
+        #every column sum stays below len(b) * 2^32, far inside int64
+        acc = np.zeros(len(a) + len(b), dtype=np.int64)
+        for i, limb in enumerate(b.tolist()):
+            if limb:
+                acc[i:i + len(a)] += limb * a
+        return DivideConquerAlgorithms.limbs_to_int(acc, 16)
+    
     @staticmethod
     def naive_python_multiply(x, y):
         #naive multiplication implemented in pure Python for fair comparison
@@ -104,6 +1070,9 @@ class DivideConquerAlgorithms:
             #for small y, add repeatedly
             for _ in range(y):
                 result += x
+        elif NUMPY_AVAILABLE:
+            #for large y, vectorized O(n^2) schoolbook on limbs
+            result = DivideConquerAlgorithms.schoolbook_multiply(x, y)
         else:
             #for large y, using a more efficient but still naive approach
             #converting to base-10 representation and multiply digit by digit
@@ -136,4 +1105,69 @@ class DivideConquerAlgorithms:
                     partial_num += digit * (10 ** j)
                 result += partial_num * (10 ** i)
         
-        return result
\ No newline at end of file
+        return result
+    
+    @staticmethod
+    def get_multiplier(method):
+        #(x, y) -> int function for a MULTIPLY_METHODS name
+        if method not in DivideConquerAlgorithms.MULTIPLY_METHODS:
+            raise ValueError(f"Unknown multiplication method: {method}")
+        return getattr(DivideConquerAlgorithms, DivideConquerAlgorithms.MULTIPLY_METHODS[method])
+    
+    @staticmethod
+    def multiply_batch(pairs, method="auto", workers=1, chunk_size=256):
+        #multiplies every (x, y) pair of an iterable, returns (products, timings)
+        #both lists in input order, timings are seconds per pair
+        #pairs are consumed in chunks so a whole file never has to be in memory at once,
+        #with workers > 1 the chunks fan out over a process pool
+        DivideConquerAlgorithms.get_multiplier(method)
+        products = []
+        timings = []
+    
+        def chunks():
+            chunk = []
+            for pair in pairs:
+                chunk.append(pair)
+                if len(chunk) == chunk_size:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+        
+        if workers <= 1:
+            for chunk in chunks():
+                for product, seconds in DivideConquerAlgorithms.multiply_chunk(chunk, method):
+                    products.append(product)
+                    timings.append(seconds)
+            return products, timings
+        
+        from concurrent.futures import ProcessPoolExecutor
+        #keep a bounded number of chunks in flight, collected in submission order
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            for chunk in chunks():
+                pending.append(executor.submit(DivideConquerAlgorithms.multiply_chunk, chunk, method))
+                if len(pending) >= 2 * workers:
+                    for product, seconds in pending.popleft().result():
+                        products.append(product)
+                        timings.append(seconds)
+            while pending:
+                for product, seconds in pending.popleft().result():
+                    products.append(product)
+                    timings.append(seconds)
+        return products, timings
+    
+    @staticmethod
+    def multiply_chunk(chunk, method):
+        #worker side of multiply_batch: [(product, seconds)] in chunk order
+        #pairs run grouped by operand size so equal-sized splits follow each other
+        multiply = DivideConquerAlgorithms.get_multiplier(method)
+        order = sorted(range(len(chunk)),
+                       key=lambda i: max(abs(chunk[i][0]).bit_length(), abs(chunk[i][1]).bit_length()))
+        results = [None] * len(chunk)
+        for i in order:
+            x, y = chunk[i]
+            start = time.perf_counter()
+            product = multiply(x, y)
+            results[i] = (product, time.perf_counter() - start)
+        return results
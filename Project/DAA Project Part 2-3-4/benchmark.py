@@ -0,0 +1,227 @@
+#headless benchmark runner, no Tk or matplotlib needed
+#usage: python benchmark.py datasets/ --engine auto --engine grid --repeat 5 --output results.json
+
+import argparse
+import csv
+import json
+import math
+import os
+import statistics
+import sys
+import time
+
+from algorithms import DivideConquerAlgorithms
+from instrumentation import AlgorithmStats
+from loader import DatasetLoader
+from profiling import RunProfiler
+from results_store import ResultsStore
+
+class BenchmarkRunner:
+    #closest pair results are checked against brute force up to this many points
+    BRUTE_FORCE_LIMIT = 2000
+    #file extensions picked up when a directory is benchmarked
+    DATASET_EXTENSIONS = ('.txt', '.bin')
+    CSV_FIELDS = ["dataset", "kind", "size", "algorithm", "engine", "workers", "representation",
+                  "warmup", "repeat", "min", "median", "p95", "mean", "correct"]
+    
+    @staticmethod
+    def summarize(times):
+        #min / median / p95 (nearest rank) / mean of a list of seconds
+        ordered = sorted(times)
+        rank = max(math.ceil(0.95 * len(ordered)) - 1, 0)
+        return {
+            "min": ordered[0],
+            "median": statistics.median(ordered),
+            "p95": ordered[rank],
+            "mean": statistics.fmean(ordered),
+        }
+    
+    @staticmethod
+    def time_call(func, warmup=1, repeat=5):
+        #runs func warmup times untimed, then repeat times timed, returns (last result, seconds list)
+        result = None
+        for _ in range(warmup):
+            result = func()
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func()
+            times.append(time.perf_counter() - start)
+        return result, times
+    
+    @staticmethod
+    def algorithm_for(kind):
+        return "closest_pair" if kind == "points" else "multiply"
+    
+    @staticmethod
+    def engines_for(algorithm, engines):
+        #the requested engines that exist for this algorithm ("auto" exists for both)
+        known = (DivideConquerAlgorithms.CLOSEST_PAIR_STRATEGIES if algorithm == "closest_pair"
+                 else DivideConquerAlgorithms.MULTIPLY_METHODS)
+        return [engine for engine in engines if engine in known]
+    
+    @staticmethod
+    def make_job(algorithm, engine, data, workers=1):
+        #zero-argument callable running one engine over a whole dataset
+        if algorithm == "closest_pair":
+            if engine not in DivideConquerAlgorithms.CLOSEST_PAIR_STRATEGIES:
+                raise ValueError(f"Unknown closest pair strategy: {engine}")
+            return lambda: DivideConquerAlgorithms.closest_pair(data, strategy=engine, workers=workers)
+        DivideConquerAlgorithms.get_multiplier(engine)
+        return lambda: DivideConquerAlgorithms.multiply_batch(data, method=engine, workers=workers)[0]
+    
+    @staticmethod
+    def check_result(algorithm, engine, data, result):
+        #True when result agrees with an independent engine (or the builtin multiply)
+        if algorithm == "closest_pair":
+            if len(data) <= BenchmarkRunner.BRUTE_FORCE_LIMIT:
+                reference = "brute_force"
+            else:
+                reference = "grid" if engine in ("auto", "divide_conquer") else "divide_conquer"
+            expected, _ = DivideConquerAlgorithms.closest_pair(data, strategy=reference)
+            return math.isclose(result[0], expected, rel_tol=1e-9) or result[0] == expected
+        return all(product == x * y for (x, y), product in zip(data, result))
+    
+    @staticmethod
+    def collect_stats(algorithm, engine, data):
+        #operation counters (AlgorithmStats.as_dict()) from one extra instrumented run,
+        #None for engines that have no counted variant
+        stats = AlgorithmStats()
+        if algorithm == "closest_pair":
+            if engine not in ("auto", "divide_conquer"):
+                return None
+            DivideConquerAlgorithms.closest_pair(data, stats=stats)
+        else:
+            if engine != "karatsuba":
+                return None
+            for x, y in data:
+                DivideConquerAlgorithms.karatsuba_multiply_counted(x, y, stats)
+        return stats.as_dict()
+    
+    @staticmethod
+    def run_dataset(filename, engines, algorithm=None, warmup=1, repeat=5, workers=1, check=True, stats=False,
+                    profile_dir=None, compact=False):
+        #benchmarks every engine on one dataset file, returns a list of result records
+        kind, data = DatasetLoader.load(filename, compact=compact)
+        dataset_algorithm = BenchmarkRunner.algorithm_for(kind)
+        if algorithm and algorithm != dataset_algorithm:
+            return []
+        records = []
+        for engine in BenchmarkRunner.engines_for(dataset_algorithm, engines):
+            job = BenchmarkRunner.make_job(dataset_algorithm, engine, data, workers)
+            result, times = BenchmarkRunner.time_call(job, warmup, repeat)
+            record = {
+                "dataset": filename,
+                "kind": kind,
+                "size": len(data),
+                "algorithm": dataset_algorithm,
+                "engine": engine,
+                "workers": workers,
+                "representation": type(data).__name__,
+                "warmup": warmup,
+                "repeat": repeat,
+                "times": times,
+            }
+            record.update(BenchmarkRunner.summarize(times))
+            record["correct"] = BenchmarkRunner.check_result(dataset_algorithm, engine, data, result) if check else None
+            if stats:
+                record["stats"] = BenchmarkRunner.collect_stats(dataset_algorithm, engine, data)
+            if profile_dir:
+                #one extra profiled run, its timings are not part of "times"
+                name = f"{os.path.splitext(os.path.basename(filename))[0]}_{engine}"
+                _, record["profile"] = RunProfiler.profile_call(job, name=name, output_dir=profile_dir)
+            records.append(record)
+        return records
+    
+    @staticmethod
+    def collect_datasets(paths):
+        #expands directories into their dataset files (sorted), keeps files as given
+        files = []
+        for path in paths:
+            if os.path.isdir(path):
+                for name in sorted(os.listdir(path)):
+                    if name.endswith(BenchmarkRunner.DATASET_EXTENSIONS):
+                        files.append(os.path.join(path, name))
+            else:
+                files.append(path)
+        return files
+    
+    @staticmethod
+    def write_results(records, output, fmt=None):
+        #writes records as JSON (full timings) or CSV (summary columns)
+        fmt = fmt or ("csv" if output.endswith(".csv") else "json")
+        if fmt == "csv":
+            with open(output, 'w', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=BenchmarkRunner.CSV_FIELDS, extrasaction='ignore')
+                writer.writeheader()
+                writer.writerows(records)
+        else:
+            with open(output, 'w') as f:
+                json.dump(records, f, indent=2)
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Benchmark divide and conquer algorithms without the GUI")
+    parser.add_argument("paths", nargs="+", help="dataset files or directories")
+    parser.add_argument("--algorithm", choices=["closest_pair", "multiply"],
+                        help="only run datasets of this algorithm (default: pick by dataset kind)")
+    parser.add_argument("--engine", action="append", dest="engines",
+                        help="closest pair strategy or multiplication method, repeatable (default: auto)")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs before measuring")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per engine")
+    parser.add_argument("--workers", type=int, default=1, help="processes for engines that support them")
+    parser.add_argument("--no-check", action="store_true", help="skip the correctness check")
+    parser.add_argument("--stats", action="store_true",
+                        help="add operation counters from one extra instrumented run (JSON output only)")
+    parser.add_argument("--profile", metavar="DIR",
+                        help="profile one extra run per engine, writing .prof/.collapsed/.json files to DIR")
+    parser.add_argument("--compact", action="store_true",
+                        help="load points as x/y columns (PointArray) instead of an (N, 2) array or tuples")
+    parser.add_argument("--output", help="write results to this .json or .csv file")
+    parser.add_argument("--format", choices=["json", "csv"], help="output format (default: from extension)")
+    parser.add_argument("--store", help="also record the runs in this results database (see results_store.py)")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.repeat < 1:
+        print("error: --repeat must be at least 1", file=sys.stderr)
+        return 2
+    engines = args.engines or ["auto"]
+    known = set(DivideConquerAlgorithms.CLOSEST_PAIR_STRATEGIES) | set(DivideConquerAlgorithms.MULTIPLY_METHODS)
+    unknown = [engine for engine in engines if engine not in known]
+    if unknown:
+        print(f"error: unknown engine(s): {', '.join(unknown)}", file=sys.stderr)
+        return 2
+    
+    records = []
+    failed = False
+    for filename in BenchmarkRunner.collect_datasets(args.paths):
+        try:
+            dataset_records = BenchmarkRunner.run_dataset(filename, engines, args.algorithm, args.warmup,
+                                                          args.repeat, args.workers, not args.no_check, args.stats,
+                                                          args.profile, args.compact)
+        except (OSError, ValueError) as e:
+            print(f"{filename}: skipped ({e})", file=sys.stderr)
+            failed = True
+            continue
+        for record in dataset_records:
+            status = {True: "ok", False: "MISMATCH", None: "unchecked"}[record["correct"]]
+            print(f"{os.path.basename(filename):40s} {record['engine']:18s} n={record['size']:<10d} "
+                  f"min={record['min']:.6f}s median={record['median']:.6f}s p95={record['p95']:.6f}s {status}")
+            failed = failed or record["correct"] is False
+        records.extend(dataset_records)
+    
+    if args.output:
+        BenchmarkRunner.write_results(records, args.output, args.format)
+        print(f"Wrote {len(records)} results to {args.output}")
+    if args.store:
+        store = ResultsStore(args.store)
+        try:
+            store.record_benchmark(records)
+        finally:
+            store.close()
+        print(f"Recorded {len(records)} results in {args.store}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+import heapq
+import math
+
+from algorithms import DivideConquerAlgorithms
+
+class DynamicClosestPair:
+    #closest pair of a point set that changes through insert(point) / delete(point)
+    #distinct points live in a hash grid with cell size h, and every pair closer than h
+    #(always in neighbouring cells) sits in a heap of candidate pairs, so the answer is
+    #the top heap entry whose points are both still present
+    #h is set to 2 * the closest distance by a rebuild (one O(n log n) closest_pair call):
+    #  - an insert or delete only scans the 3x3 cells around the point; right after a
+    #    rebuild points are at least h / 2 apart, so these hold O(1) points
+    #  - points packed closer than that crowd the cells; every scan beyond
+    #    NEIGHBOURHOOD_LIMIT ids is charged to a budget of one rebuild (n log2 n checks)
+    #    and the structure rebuilds at the smaller scale once it is spent, so crowding
+    #    never costs more than the rebuild that removes it and the heap stays bounded
+    #  - a delete only drops the point, heap entries are invalidated lazily; the heap
+    #    still holds every pair closer than h, so only when none is left does the next
+    #    closest_pair() query rebuild at the larger scale
+    #a stream that inserts and deletes one very close point over and over therefore
+    #keeps h and never rebuilds, instead of rebuilding on every update
+    #exact duplicates are counted instead of stored, any duplicate is a pair at distance 0
+    NEIGHBOURHOOD_LIMIT = 64
+    
+    def __init__(self, points=()):
+        self.counts = {}
+        self.duplicates = set()
+        self.ids = {}
+        self.points = {}
+        self.next_id = 0
+        self.grid = {}
+        self.heap = []
+        self.stale = 0
+        self.size = None
+        self.budget = 0
+        self.total = 0
+        for point in points:
+            point = tuple(point)
+            self.total += 1
+            self.counts[point] = self.counts.get(point, 0) + 1
+            if self.counts[point] == 2:
+                self.duplicates.add(point)
+            if self.counts[point] == 1:
+                self.add_id(point)
+        self.rebuild()
+    
+    def __len__(self):
+        return self.total
+    
+    def __contains__(self, point):
+        return tuple(point) in self.counts
+    
+    def add_id(self, point):
+        self.ids[point] = self.next_id
+        self.points[self.next_id] = point
+        self.next_id += 1
+        return self.ids[point]
+    
+    def cell(self, point):
+        return (point[0] // self.size, point[1] // self.size)
+    
+    def neighbours(self, point):
+        #ids in the 3x3 cells around point
+        cx, cy = self.cell(point)
+        for gx in (cx - 1, cx, cx + 1):
+            for gy in (cy - 1, cy, cy + 1):
+                cell = self.grid.get((gx, gy))
+                if cell:
+                    yield from cell
+    
+    def rebuild(self):
+        #grid and candidate heap from scratch at h = 2 * the current closest distance
+        self.grid = {}
+        self.heap = []
+        self.stale = 0
+        self.budget = len(self.points) * max(len(self.points).bit_length(), 1)
+        if len(self.points) < 2:
+            self.size = None
+            return
+        distinct = list(self.points.values())
+        min_dist, pair = DivideConquerAlgorithms.closest_pair(distinct, strategy="auto")
+        a, b = pair
+        d2 = (a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2
+        if isinstance(d2, int):
+            self.size = math.isqrt(4 * d2 - 1) + 1  #ceil(2 * distance), exact integer cells
+        else:
+            #slightly widened so rounding can never push a neighbour two cells away
+            self.size = 2 * min_dist * (1 + 1e-9)
+        limit = self.size * self.size
+        for i, point in self.points.items():
+            for j in self.neighbours(point):
+                q = self.points[j]
+                d2 = (point[0] - q[0]) ** 2 + (point[1] - q[1]) ** 2
+                if d2 <= limit:
+                    self.heap.append((d2, j, i))
+            self.grid.setdefault(self.cell(point), set()).add(i)
+        heapq.heapify(self.heap)
+    
+    def insert(self, point):
+        point = tuple(point)
+        count = self.counts.get(point, 0) + 1
+        self.counts[point] = count
+        self.total += 1
+        if count > 1:
+            self.duplicates.add(point)
+            return
+        i = self.add_id(point)
+        if self.size is None:
+            self.rebuild()
+            return
+        
+        limit = self.size * self.size
+        scanned = 0
+        for j in self.neighbours(point):
+            scanned += 1
+            q = self.points[j]
+            d2 = (point[0] - q[0]) ** 2 + (point[1] - q[1]) ** 2
+            if d2 <= limit:
+                heapq.heappush(self.heap, (d2, j, i))
+        self.grid.setdefault(self.cell(point), set()).add(i)
+        self.charge(scanned)
+    
+    def delete(self, point):
+        #removes one copy of point, KeyError if it is not in the set
+        point = tuple(point)
+        count = self.counts[point] - 1
+        self.total -= 1
+        if count > 0:
+            self.counts[point] = count
+            if count == 1:
+                self.duplicates.discard(point)
+            return
+        del self.counts[point]
+        i = self.ids.pop(point)
+        del self.points[i]
+        if self.size is None:
+            return
+        key = self.cell(point)
+        self.grid[key].discard(i)
+        if not self.grid[key]:
+            del self.grid[key]
+        
+        #every heap entry with this point is now stale
+        limit = self.size * self.size
+        scanned = 0
+        for j in self.neighbours(point):
+            scanned += 1
+            q = self.points[j]
+            if (point[0] - q[0]) ** 2 + (point[1] - q[1]) ** 2 <= limit:
+                self.stale += 1
+        self.discard_stale()
+        if self.stale > len(self.heap) // 2:
+            self.heap = [entry for entry in self.heap if entry[1] in self.points and entry[2] in self.points]
+            heapq.heapify(self.heap)
+            self.stale = 0
+        self.charge(scanned)
+    
+    def charge(self, scanned):
+        #bills the ids an update scanned beyond NEIGHBOURHOOD_LIMIT to the rebuild budget,
+        #rebuilding at the current closest distance once crowding has cost as much as that
+        excess = scanned - DynamicClosestPair.NEIGHBOURHOOD_LIMIT
+        if excess > 0:
+            self.budget -= excess
+            if self.budget <= 0:
+                self.rebuild()
+    
+    def discard_stale(self):
+        #pops stale entries off the top of the heap
+        while self.heap and (self.heap[0][1] not in self.points or self.heap[0][2] not in self.points):
+            heapq.heappop(self.heap)
+            self.stale -= 1
+    
+    def closest_pair(self):
+        #(distance, (p, q)) like DivideConquerAlgorithms.closest_pair, (inf, None) below 2 points
+        if self.duplicates:
+            point = next(iter(self.duplicates))
+            return 0.0, (point, point)
+        self.discard_stale()
+        if not self.heap and len(self.points) >= 2:
+            #no pair closer than h is left, the closest one is further apart
+            self.rebuild()
+        if not self.heap:
+            return float('inf'), None
+        d2, i, j = self.heap[0]
+        return math.sqrt(d2), (self.points[i], self.points[j])
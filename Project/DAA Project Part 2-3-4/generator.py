@@ -1,88 +1,264 @@
+import argparse
+import hashlib
 import random
 import os
+import sys
+
+from loader import DatasetLoader
+
+#numpy is optional, without it only uniform text point datasets can be generated
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
 
 class InputGenerator:
+    #coordinate range for each complexity level
+    COMPLEXITY_MAX_VALUES = {"low": 100, "medium": 1000, "high": 10000}
+    #point distributions:
+    #  uniform    - independent uniform coordinates
+    #  clustered  - gaussian blobs around random centres
+    #  collinear  - every point on one line through the origin
+    #  duplicates - drawn with replacement from a small pool, so many exact repeats
+    #  strip      - adversarial case for the combine step: a narrow vertical band evenly
+    #               spaced in y, so every point falls in the strip around the median line
+    POINT_DISTRIBUTIONS = ("uniform", "clustered", "collinear", "duplicates", "strip")
+    #points generated and written per block, bounds memory for very large datasets
+    BLOCK_SIZE = 1 << 20
+    #default corpus built by generate_all_datasets: dataset sizes, one file per entry
+    POINTS_SIZES = tuple(100 + i * 50 for i in range(10))  #varying sizes from 100-550
+    INTEGERS_SIZES = tuple(100 + i * 20 for i in range(10))  #varying sizes
+    #generate_all_datasets only starts a process pool by default when the corpus holds at
+    #least this many points and integers in total, below it the pool start-up costs more
+    #than the generation it spreads out
+    PARALLEL_MIN_ITEMS = 1000000
+    
     @staticmethod
-    def generate_points_dataset(filename, num_points, complexity="medium"):
-        #generate random points dataset
-        if complexity == "low":
-            max_val = 100
-        elif complexity == "medium":
-            max_val = 1000
-        else:  #high
-            max_val = 10000
+    def point_blocks(num_points, distribution="uniform", max_val=1000, seed=None, block_size=None):
+        #yields (k, 2) int64 arrays, num_points in total, from one numpy Generator
+        #the same seed and block_size always give the same points
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for the vectorized point generator")
+        if distribution not in InputGenerator.POINT_DISTRIBUTIONS:
+            raise ValueError(f"Unknown point distribution: {distribution}")
+        block_size = block_size or InputGenerator.BLOCK_SIZE
+        rng = np.random.default_rng(seed)
+        
+        #state shared by every block
+        if distribution == "clustered":
+            clusters = max(int(num_points ** 0.5) // 4, 1)
+            centres = rng.integers(0, max_val + 1, size=(clusters, 2))
+            spread = max(max_val / (8 * clusters ** 0.5), 1.0)
+        elif distribution == "collinear":
+            direction = rng.integers(1, 4, size=2)
+            steps = max_val // int(direction.max())
+        elif distribution == "duplicates":
+            pool = rng.integers(0, max_val + 1, size=(max(num_points // 10, 1), 2))
+        elif distribution == "strip":
+            #y spacing of about max_val / num_points (at least 1), x jitter well inside it
+            spacing = max(max_val // max(num_points, 1), 1)
+            width = spacing // 4
+        
+        for start in range(0, num_points, block_size):
+            k = min(block_size, num_points - start)
+            if distribution == "uniform":
+                block = rng.integers(0, max_val + 1, size=(k, 2))
+            elif distribution == "clustered":
+                offsets = rng.normal(0.0, spread, size=(k, 2))
+                block = np.clip(np.rint(centres[rng.integers(0, len(centres), size=k)] + offsets), 0, max_val)
+            elif distribution == "collinear":
+                block = rng.integers(0, steps + 1, size=(k, 1)) * direction
+            elif distribution == "duplicates":
+                block = pool[rng.integers(0, len(pool), size=k)]
+            else:
+                ys = (start + rng.permutation(k)) * spacing
+                xs = max_val // 2 + rng.integers(-width, width + 1, size=k)
+                block = np.column_stack((xs, ys))
+            yield block.astype(np.int64)
+    
+    @staticmethod
+    def write_point_blocks(filename, blocks, num_points, binary=False):
+        #bulk writes point blocks as "x,y" lines or as a binary dataset (see loader.py)
+        os.makedirs(os.path.dirname(filename) if os.path.dirname(filename) else '.', exist_ok=True)
+        if not binary:
+            with open(filename, 'w') as f:
+                for block in blocks:
+                    #one % over the whole block is several times faster than np.savetxt
+                    f.write(('%d,%d\n' * len(block)) % tuple(block.ravel().tolist()))
+            return
+        
+        #coordinates are stored as int32, the record count is patched into the header at the end
+        dtype_code = 0
+        with open(filename, 'wb') as out:
+            out.write(b'\0' * DatasetLoader.BINARY_HEADER.size)
+            for block in blocks:
+                if len(block) and (block.min() < -2**31 or block.max() >= 2**31):
+                    raise ValueError("Binary point datasets are written as int32, coordinates are too large")
+                out.write(block.astype(DatasetLoader.BINARY_DTYPES[dtype_code]).tobytes())
+            out.seek(0)
+            out.write(DatasetLoader.binary_header("points", dtype_code, num_points))
+    
+    @staticmethod
+    def generate_points_dataset(filename, num_points, complexity="medium", distribution="uniform",
+                                seed=None, binary=None):
+        #generate random points dataset, binary defaults to True for .bin filenames
+        max_val = InputGenerator.COMPLEXITY_MAX_VALUES.get(complexity, 10000)
+        if binary is None:
+            binary = filename.endswith('.bin')
+        
+        if NUMPY_AVAILABLE:
+            blocks = InputGenerator.point_blocks(num_points, distribution, max_val, seed)
+            if num_points <= InputGenerator.BLOCK_SIZE:
+                #small datasets are returned to the caller as well
+                blocks = list(blocks)
+            InputGenerator.write_point_blocks(filename, blocks, num_points, binary)
+            print(f"Generated {filename} with {num_points} points")
+            if isinstance(blocks, list):
+                return np.concatenate(blocks) if blocks else np.empty((0, 2), dtype=np.int64)
+            return None
         
+        if distribution != "uniform" or binary:
+            raise ImportError("numpy is required for non-uniform or binary point datasets")
+        rng = random.Random(seed)
         points = []
         for _ in range(num_points):
-            x = random.randint(0, max_val)
-            y = random.randint(0, max_val)
+            x = rng.randint(0, max_val)
+            y = rng.randint(0, max_val)
             points.append((x, y))
         
         os.makedirs(os.path.dirname(filename) if os.path.dirname(filename) else '.', exist_ok=True)
         
         with open(filename, 'w') as f:
-            for point in points:
-                f.write(f"{point[0]},{point[1]}\n")
+            f.write(''.join(f"{point[0]},{point[1]}\n" for point in points))
         
         print(f"Generated {filename} with {num_points} points")
         return points
     
     @staticmethod
-    def generate_integers_dataset(filename, num_integers, complexity="medium"):
-        #generate random integers dataset
+    def generate_integers_dataset(filename, num_integers, complexity="medium", seed=None, binary=None):
+        #generate random integers dataset, binary defaults to True for .bin filenames
         if complexity == "low":
             max_digits = 10
         elif complexity == "medium":
             max_digits = 50
         else:  #high
             max_digits = 100
+        if binary is None:
+            binary = filename.endswith('.bin')
         
+        rng = random.Random(seed)
         integers = []
         num_pairs = num_integers // 2
         for _ in range(num_pairs):
-            digits1 = random.randint(max_digits - 5, max_digits)
-            digits2 = random.randint(max_digits - 5, max_digits)
+            digits1 = rng.randint(max_digits - 5, max_digits)
+            digits2 = rng.randint(max_digits - 5, max_digits)
             
-            num1 = random.randint(10**(digits1-1), 10**digits1 - 1)
-            num2 = random.randint(10**(digits2-1), 10**digits2 - 1)
+            num1 = rng.randint(10**(digits1-1), 10**digits1 - 1)
+            num2 = rng.randint(10**(digits2-1), 10**digits2 - 1)
             
             integers.append((num1, num2))
         
         os.makedirs(os.path.dirname(filename) if os.path.dirname(filename) else '.', exist_ok=True)
         
-        with open(filename, 'w') as f:
-            for pair in integers:
-                f.write(f"{pair[0]},{pair[1]}\n")
+        if binary:
+            with open(filename, 'wb') as f:
+                f.write(DatasetLoader.binary_header("integers", 3, num_pairs))
+                f.write(b''.join(DatasetLoader.pack_integer(a) + DatasetLoader.pack_integer(b) for a, b in integers))
+        else:
+            with open(filename, 'w') as f:
+                f.write(''.join(f"{pair[0]},{pair[1]}\n" for pair in integers))
         
         print(f"Generated {filename} with {num_pairs} integer pairs")
         return integers
     
     @staticmethod
-    def generate_all_datasets():
-        #generate 10 datasets for each problem
+    def file_seed(master_seed, kind, index):
+        #independent 64-bit seed for one dataset file, fixed by the master seed and the
+        #file's kind and index only, so the output does not depend on the worker count
+        digest = hashlib.sha256(f"{master_seed}:{kind}:{index}".encode()).digest()
+        return int.from_bytes(digest[:8], 'little')
+    
+    @staticmethod
+    def generate_dataset_file(kind, filename, size, complexity, seed, binary):
+        #one dataset of a corpus, run in a worker process
+        if kind == "points":
+            InputGenerator.generate_points_dataset(filename, size, complexity, seed=seed, binary=binary)
+        else:
+            InputGenerator.generate_integers_dataset(filename, size, complexity, seed=seed, binary=binary)
+        return filename
+    
+    @staticmethod
+    def generate_all_datasets(datasets_dir="datasets", points_sizes=None, integers_sizes=None,
+                              master_seed=None, workers=None, binary=False):
+        #generate one points dataset per entry of points_sizes and one integers dataset per
+        #entry of integers_sizes (10 of each by default), workers files at a time
+        #workers=None is serial for small corpora and all cores from PARALLEL_MIN_ITEMS on
+        #the same master_seed gives byte-identical files for any number of workers
+        points_sizes = InputGenerator.POINTS_SIZES if points_sizes is None else points_sizes
+        integers_sizes = InputGenerator.INTEGERS_SIZES if integers_sizes is None else integers_sizes
+        if master_seed is None:
+            master_seed = random.SystemRandom().randrange(2**63)
+            print(f"Master seed: {master_seed}")
+        if workers is None:
+            total = sum(points_sizes) + sum(integers_sizes)
+            workers = (os.cpu_count() or 1) if total >= InputGenerator.PARALLEL_MIN_ITEMS else 1
+        extension = "bin" if binary else "txt"
         
         #datasets directory
-        datasets_dir = "datasets"
         os.makedirs(datasets_dir, exist_ok=True)
         
-        #generate points datasets
-        points_files = []
         complexities = ["low", "medium", "high"]
+        tasks = []
+        for kind, sizes in (("points", points_sizes), ("integers", integers_sizes)):
+            for i, size in enumerate(sizes):
+                complexity = complexities[i % 3]
+                filename = f"{datasets_dir}/{kind}_dataset_{i+1}_{complexity}.{extension}"
+                tasks.append((kind, filename, size, complexity,
+                              InputGenerator.file_seed(master_seed, kind, i), binary))
         
-        for i in range(10):
-            complexity = complexities[i % 3]
-            size = 100 + i * 50  #varying sizes from 100-550
-            filename = f"{datasets_dir}/points_dataset_{i+1}_{complexity}.txt"
-            InputGenerator.generate_points_dataset(filename, size, complexity)
-            points_files.append(filename)
-        
-        #generate integers datasets
-        integers_files = []
-        for i in range(10):
-            complexity = complexities[i % 3]
-            size = 100 + i * 20  #varying sizes
-            filename = f"{datasets_dir}/integers_dataset_{i+1}_{complexity}.txt"
-            InputGenerator.generate_integers_dataset(filename, size, complexity)
-            integers_files.append(filename)
-        
-        return points_files, integers_files
\ No newline at end of file
+        if workers > 1 and len(tasks) > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+                futures = [executor.submit(InputGenerator.generate_dataset_file, *task) for task in tasks]
+                for future in futures:
+                    future.result()
+        else:
+            for task in tasks:
+                InputGenerator.generate_dataset_file(*task)
+        
+        points_files = [task[1] for task in tasks if task[0] == "points"]
+        integers_files = [task[1] for task in tasks if task[0] == "integers"]
+        return points_files, integers_files
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate datasets for the divide and conquer algorithms")
+    sub = parser.add_subparsers(dest="command", required=True)
+    
+    points = sub.add_parser("points", help="one points dataset, .bin targets are written in binary")
+    points.add_argument("filename")
+    points.add_argument("count", type=float, help="number of points (1e8 style accepted)")
+    points.add_argument("--distribution", choices=InputGenerator.POINT_DISTRIBUTIONS, default="uniform")
+    points.add_argument("--complexity", choices=list(InputGenerator.COMPLEXITY_MAX_VALUES), default="high")
+    points.add_argument("--seed", type=int)
+    
+    corpus = sub.add_parser("all", help="a corpus of points and integers datasets")
+    corpus.add_argument("--output", default="datasets", help="directory for the dataset files")
+    corpus.add_argument("--points-sizes", type=int, nargs="*", help="one points dataset per size")
+    corpus.add_argument("--integers-sizes", type=int, nargs="*", help="one integers dataset per size (numbers per file)")
+    corpus.add_argument("--seed", type=int, help="master seed (default: random, printed)")
+    corpus.add_argument("--workers", type=int, help="processes to generate with (default: serial for small corpora, all cores for large ones)")
+    corpus.add_argument("--binary", action="store_true", help="write .bin datasets instead of .txt")
+    args = parser.parse_args(argv)
+    
+    if args.command == "points":
+        InputGenerator.generate_points_dataset(args.filename, int(args.count), args.complexity,
+                                               args.distribution, args.seed)
+    else:
+        points_files, integers_files = InputGenerator.generate_all_datasets(
+            args.output, args.points_sizes, args.integers_sizes, args.seed, args.workers, args.binary)
+        print(f"Generated {len(points_files)} points and {len(integers_files)} integers datasets in {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
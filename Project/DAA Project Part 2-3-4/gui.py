@@ -1,24 +1,39 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from tkinter.font import Font
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import numpy as np
 import time
-import timeit
 import os
+import io
+import base64
 
-#try to import pyglet for font loading, fallback if not available
-try:
-    import pyglet
-    PYGLET_AVAILABLE = True
-except ImportError:
-    PYGLET_AVAILABLE = False
-    print("Warning: pyglet not installed. Install it with 'pip install pyglet' for custom font support.")
+#matplotlib and pyglet are not imported here: startup_job loads them on a worker
+#thread once the window is up, and get_viz_figure imports matplotlib on first use
 
 from algorithms import DivideConquerAlgorithms
 from generator import InputGenerator
+from loader import DatasetLoader
+from point_array import PointArray
+from results_store import ResultsStore
+from result_cache import ResultCache
+from jobs import JobRunner
+from instrumentation import AlgorithmStats
+from profiling import RunProfiler
 
 class DivideConquerGUI:
+    #closest pair plots with more points than this draw a density raster instead of markers
+    SCATTER_LIMIT = 20000
+    DENSITY_BINS = 400
+    #multipliers the integer run times and validates over the whole dataset, in the order
+    #of each case's timings tuple
+    MULTIPLY_METHODS = ("karatsuba", "standard", "naive")
+    #pairs per multiply_batch call, a cancel is noticed between chunks
+    MULTIPLY_CHUNK = 256
+    #leading pairs reported in full, the rest get one line per chunk
+    MULTIPLY_DETAIL_CASES = 3
+    #integer plots with more cases than this leave out the per-case labels
+    MULTIPLY_LABELLED_CASES = 20
+    
     def __init__(self, root):
         self.root = root
         self.root.title("Divide and Conquer Algorithms Analyzer")
@@ -37,88 +52,104 @@ class DivideConquerGUI:
             'warning': '#f39c12'
         }
         self.algorithms = DivideConquerAlgorithms()
+        self.jobs = JobRunner(root)
+        self.multiplication_cases = []
+        #(index, timings, results match) of each pair, what the cache keeps
+        self.multiplication_results = []
+        self.viz_figure = None
+        self.viz_figure_canvas = None
+        self.viz_image_label = None
         self.current_points = []
         self.current_integers = []
+        self.current_file = None
+        self.current_hash = None
+        self.results_db = os.path.join(os.path.dirname(os.path.abspath(__file__)), ResultsStore.DEFAULT_PATH)
+        self.profiles_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles")
+        #cached runs are keyed by dataset content and invalidated when any module of this folder changes (see result_cache.py)
+        self.cache_db = os.path.join(os.path.dirname(os.path.abspath(__file__)), ResultCache.DEFAULT_PATH)
         self.setup_fonts()
         self.setup_styles()
         self.setup_ui()
+        
+        #slow imports and font registration happen after the window is up
+        self.startup_jobs = JobRunner(root)
+        self.startup_jobs.submit(self.startup_job,
+                                 on_partial=self.apply_fonts,
+                                 on_done=self.startup_done,
+                                 on_error=self.startup_failed)
     
     def setup_fonts(self):
-        """Load Poppins fonts from local files using pyglet"""
-        fonts_dir = os.path.join(os.path.dirname(__file__), "fonts")
-        font_family = "Poppins"
-        
-        #try to load Poppins fonts using pyglet
-        if PYGLET_AVAILABLE:
-            try:
-                regular_path = os.path.join(fonts_dir, "Poppins-Regular.ttf")
-                bold_path = os.path.join(fonts_dir, "Poppins-Bold.ttf")
-                semibold_path = os.path.join(fonts_dir, "Poppins-SemiBold.ttf")
-                medium_path = os.path.join(fonts_dir, "Poppins-Medium.ttf")
-                
-                # Load fonts using pyglet to make them available to Tkinter
-                if os.path.exists(regular_path):
-                    pyglet.font.add_file(regular_path)
-                if os.path.exists(bold_path):
-                    pyglet.font.add_file(bold_path)
-                if os.path.exists(semibold_path):
-                    pyglet.font.add_file(semibold_path)
-                if os.path.exists(medium_path):
-                    pyglet.font.add_file(medium_path)
-                
-            except Exception as e:
-                print(f"Warning: Could not load Poppins fonts with pyglet: {e}")
-                font_family = "Arial"
-        else:
-            # Check if Poppins is installed system-wide
-            try:
-                # Try to create a test font to see if Poppins is available
-                test_font = Font(family="Poppins", size=10)
-                # If no error, Poppins is available
-            except:
-                font_family = "Arial"
+        """Create the UI fonts, Poppins replaces the fallback family once it is loaded"""
+        #widgets keep references to these named fonts, so changing their family later
+        #(apply_fonts) restyles the whole window without rebuilding it
+        font_family = "Arial"
+        self.font_regular = Font(family=font_family, size=10)
+        self.font_medium = Font(family=font_family, size=10)
+        self.font_semibold = Font(family=font_family, size=10)
+        self.font_bold = Font(family=font_family, size=10, weight="bold")
+        
+        self.font_title = Font(family=font_family, size=18, weight="bold")
+        self.font_subtitle = Font(family=font_family, size=12)  
+        self.font_label = Font(family=font_family, size=12, weight="bold")
+        self.font_button = Font(family=font_family, size=10, weight="bold")
+        self.font_text = Font(family=font_family, size=11)  
         
-        # Verify font is available by checking font families
+        self.font_code = Font(family="Consolas", size=10)
+    
+    def startup_job(self, job):
+        #runs on a worker thread once the window is up, must not touch any Tk widget
+        #registers the Poppins fonts, then imports the plotting stack so the first
+        #chart does not pay for it
+        start_time = time.perf_counter()
+        job.emit(self.register_fonts())
+        from matplotlib.figure import Figure
+        from matplotlib.backends import backend_tkagg
+        return time.perf_counter() - start_time
+    
+    def register_fonts(self):
+        """Load Poppins fonts from local files using pyglet, True if they were registered"""
+        #pyglet is imported here rather than at startup, it is only needed for this
         try:
-            from tkinter import font as tkfont
-            available_families = list(tkfont.families())
-            if font_family not in available_families:
-                # Try alternative names
-                poppins_variants = [f for f in available_families if 'Poppins' in f or 'poppins' in f.lower()]
-                if poppins_variants:
-                    font_family = poppins_variants[0]
-                else:
-                    font_family = "Arial"
-                    print("Warning: Poppins font not found, using Arial as fallback")
-        except:
-            font_family = "Arial"
+            import pyglet
+        except ImportError:
+            print("Warning: pyglet not installed. Install it with 'pip install pyglet' for custom font support.")
+            return False
         
-        #create font variants with different sizes
+        fonts_dir = os.path.join(os.path.dirname(__file__), "fonts")
         try:
-            self.font_regular = Font(family=font_family, size=10)
-            self.font_medium = Font(family=font_family, size=10)
-            self.font_semibold = Font(family=font_family, size=10)
-            self.font_bold = Font(family=font_family, size=10, weight="bold")
-            
-            self.font_title = Font(family=font_family, size=18, weight="bold")
-            self.font_subtitle = Font(family=font_family, size=12)  
-            self.font_label = Font(family=font_family, size=12, weight="bold")
-            self.font_button = Font(family=font_family, size=10, weight="bold")
-            self.font_text = Font(family=font_family, size=11)  
-        except:
-            #fallback to Arial if Poppins fails
-            font_family = "Arial"
-            self.font_regular = Font(family=font_family, size=10)
-            self.font_medium = Font(family=font_family, size=10)
-            self.font_semibold = Font(family=font_family, size=10)
-            self.font_bold = Font(family=font_family, size=10, weight="bold")
-            self.font_title = Font(family=font_family, size=18, weight="bold")
-            self.font_subtitle = Font(family=font_family, size=12)
-            self.font_label = Font(family=font_family, size=12, weight="bold")
-            self.font_button = Font(family=font_family, size=10, weight="bold")
-            self.font_text = Font(family=font_family, size=11)
-        
-        self.font_code = Font(family="Consolas", size=10)
+            for name in ("Poppins-Regular.ttf", "Poppins-Bold.ttf", "Poppins-SemiBold.ttf", "Poppins-Medium.ttf"):
+                path = os.path.join(fonts_dir, name)
+                # Load fonts using pyglet to make them available to Tkinter
+                if os.path.exists(path):
+                    pyglet.font.add_file(path)
+        except Exception as e:
+            print(f"Warning: Could not load Poppins fonts with pyglet: {e}")
+            return False
+        return True
+    
+    def apply_fonts(self, registered):
+        #switches the UI fonts to Poppins if it is available now (registered by
+        #register_fonts or installed system-wide)
+        from tkinter import font as tkfont
+        available_families = list(tkfont.families())
+        if "Poppins" in available_families:
+            font_family = "Poppins"
+        else:
+            # Try alternative names
+            poppins_variants = [f for f in available_families if 'Poppins' in f or 'poppins' in f.lower()]
+            if not poppins_variants:
+                print("Warning: Poppins font not found, using Arial as fallback")
+                return
+            font_family = poppins_variants[0]
+        for font in (self.font_regular, self.font_medium, self.font_semibold, self.font_bold, self.font_title,
+                     self.font_subtitle, self.font_label, self.font_button, self.font_text):
+            font.configure(family=font_family)
+    
+    def startup_done(self, seconds):
+        print(f"Fonts and plotting stack loaded in the background in {seconds * 1000:.0f} ms")
+    
+    def startup_failed(self, error):
+        print(f"Warning: background startup work failed: {error}")
         
     def setup_styles(self):
         style = ttk.Style()
@@ -158,6 +189,13 @@ class DivideConquerGUI:
         style.map('TRadiobutton',
                  background=[('active', self.colors['light_bg'])],
                  foreground=[('active', self.colors['text'])])
+        style.configure('TCheckbutton',
+                       background=self.colors['dark_bg'],
+                       foreground=self.colors['text'],
+                       font=self.font_text)
+        style.map('TCheckbutton',
+                 background=[('active', self.colors['light_bg'])],
+                 foreground=[('active', self.colors['text'])])
         style.configure('TLabel',
                        background=self.colors['light_bg'],
                        foreground=self.colors['text'],
@@ -301,12 +339,32 @@ class DivideConquerGUI:
                        variable=self.algo_var, value="integer_mult",
                        style='TRadiobutton').grid(row=0, column=1, sticky=tk.W)
         
+        #operation counters come from one extra instrumented run, the timed run stays plain
+        self.stats_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(algo_choice_frame, text="📈 Count operations",
+                        variable=self.stats_var,
+                        style='TCheckbutton').grid(row=0, column=2, sticky=tk.W, padx=(30, 0))
+        
+        #cProfile + tracemalloc on one extra run, files go to the profiles folder
+        self.profile_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(algo_choice_frame, text="🔬 Profile run",
+                        variable=self.profile_var,
+                        style='TCheckbutton').grid(row=0, column=3, sticky=tk.W, padx=(30, 0))
+        
         #run button
         self.run_button = ttk.Button(content_frame, text="🚀 Run Algorithm", 
                                     command=self.run_algorithm, 
                                     style='TButton',
                                     width=20)
         self.run_button.grid(row=0, column=1, padx=(20, 0), sticky=tk.E)
+        
+        #cancel button, only enabled while a run is in progress
+        self.cancel_button = ttk.Button(content_frame, text="⛔ Cancel",
+                                       command=self.cancel_algorithm,
+                                       style='TButton',
+                                       state=tk.DISABLED,
+                                       width=12)
+        self.cancel_button.grid(row=0, column=2, padx=(10, 0), sticky=tk.E)
     
     def create_results_section(self, parent):
         #Create results display section
@@ -447,7 +505,7 @@ class DivideConquerGUI:
     def browse_file(self):
         filename = filedialog.askopenfilename(
             title="Select dataset file",
-            filetypes=[("Text files", "*.txt"), ("All files", "*.*")]
+            filetypes=[("Text files", "*.txt"), ("Binary datasets", "*.bin"), ("All files", "*.*")]
         )
         if filename:
             self.file_var.set(filename)
@@ -459,7 +517,8 @@ class DivideConquerGUI:
             self.progress.start()
             self.root.update()
             
-            points_files, integers_files = InputGenerator.generate_all_datasets()
+            #serial, this runs on the Tk thread and the default corpus is small
+            points_files, integers_files = InputGenerator.generate_all_datasets(workers=1)
             all_files = points_files + integers_files
             self.file_combo['values'] = all_files
             
@@ -502,8 +561,10 @@ class DivideConquerGUI:
             self.progress.start()
             self.root.update()
             
-            with open(filename, 'r') as f:
-                lines = f.readlines()
+            #format is detected from the file content, points come back as x/y columns (PointArray)
+            kind, data = DatasetLoader.load(filename, compact=True)
+            self.current_file = filename
+            self.current_hash = ResultsStore.dataset_hash(filename)
             
             self.current_points = []
             self.current_integers = []
@@ -512,24 +573,18 @@ class DivideConquerGUI:
             self.results_text.config(state=tk.NORMAL)
             self.results_text.delete(1.0, tk.END)
             
-            if 'points' in filename.lower():
+            if kind == "points":
                 #load points
-                for line in lines:
-                    if line.strip():
-                        x, y = map(int, line.strip().split(','))
-                        self.current_points.append((x, y))
+                self.current_points = data
                 
                 self.results_text.insert(tk.END, f"✅ SUCCESS: Loaded {len(self.current_points)} points\n")
                 self.results_text.insert(tk.END, f"📊 Dataset: {os.path.basename(filename)}\n")
                 self.results_text.insert(tk.END, f"🎯 Ready for Closest Pair algorithm\n\n")
                 self.file_info_var.set(f"📍 Points dataset: {len(self.current_points)} points")
                 
-            elif 'integers' in filename.lower():
+            elif kind == "integers":
                 #load integers
-                for line in lines:
-                    if line.strip():
-                        x, y = map(int, line.strip().split(','))
-                        self.current_integers.append((x, y))
+                self.current_integers = data
                 
                 self.results_text.insert(tk.END, f"✅ SUCCESS: Loaded {len(self.current_integers)} integer pairs\n")
                 self.results_text.insert(tk.END, f"📊 Dataset: {os.path.basename(filename)}\n")
@@ -553,10 +608,12 @@ class DivideConquerGUI:
             self.progress.stop()
 
     def run_algorithm(self):
+        if self.jobs.busy():
+            return
         algorithm = self.algo_var.get()
         
         if algorithm == "closest_pair":
-            if self.current_points:
+            if len(self.current_points) > 0:
                 self.run_closest_pair()
             else:
                 messagebox.showwarning("Warning", 
@@ -571,13 +628,49 @@ class DivideConquerGUI:
                     "🧮 No integers data loaded!\n"
                     "Please load an integers dataset file first.")
     
+    def start_job(self, func, *args, on_done=None, on_partial=None):
+        #run func(job, *args) on the background worker, the Tk loop keeps running meanwhile
+        self.run_button.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
+        self.progress.start()
+        self.jobs.submit(func, *args,
+                         on_progress=self.job_progress,
+                         on_partial=on_partial,
+                         on_done=on_done,
+                         on_error=self.job_failed,
+                         on_cancel=self.job_cancelled)
+    
+    def finish_job(self, status):
+        self.progress.stop()
+        self.run_button.config(state=tk.NORMAL)
+        self.cancel_button.config(state=tk.DISABLED)
+        self.status_var.set(status)
+        self.results_text.see(tk.END)
+    
+    def job_progress(self, message, fraction):
+        if message:
+            self.status_var.set(message if fraction is None else f"{message} ({fraction:.0%})")
+    
+    def job_failed(self, error):
+        self.results_text.insert(tk.END, f"💥 Error: {str(error)}\n")
+        self.finish_job("❌ Algorithm failed")
+        messagebox.showerror("Error", f"Algorithm failed: {str(error)}")
+    
+    def job_cancelled(self, _):
+        self.results_text.insert(tk.END, "\n⛔ Run cancelled\n")
+        self.finish_job("⛔ Run cancelled")
+    
+    def cancel_algorithm(self):
+        #the run stops at its next check, the controls come back once it has exited
+        if self.jobs.cancel():
+            self.cancel_button.config(state=tk.DISABLED)
+            self.status_var.set("⏳ Cancelling, waiting for the current step to finish...")
+    
     def run_closest_pair(self):
-        if not self.current_points:
+        if len(self.current_points) == 0:
             return
         
         self.status_var.set("🔄 Running Closest Pair Algorithm...")
-        self.progress.start()
-        self.root.update()
         
         #clear previous results but keep styling
         self.results_text.config(state=tk.NORMAL)
@@ -585,153 +678,280 @@ class DivideConquerGUI:
         self.results_text.insert(tk.END, "📍 CLOSEST PAIR ALGORITHM EXECUTION\n")
         self.results_text.insert(tk.END, "═" * 60 + "\n")
         
+        cached = self.cache_lookup("closest_pair", "auto")
+        if cached is not None:
+            payload = cached["payload"]
+            result = (self.current_points, payload["min_dist"], tuple(tuple(point) for point in payload["pair"]),
+                      payload["time"], None, None)
+            self.show_closest_pair(result, cached)
+            return
+        
+        self.start_job(self.closest_pair_job, self.current_points, self.stats_var.get(), self.profile_var.get(),
+                       on_done=self.show_closest_pair)
+    
+    def closest_pair_job(self, job, points, collect_stats, profile):
+        #runs on the worker thread, must not touch any Tk widget
         start_time = time.time()
-        min_dist, closest_pair = self.algorithms.closest_pair(self.current_points)
+        min_dist, closest_pair = self.algorithms.closest_pair(points)
         end_time = time.time()
-        execution_time = end_time - start_time
+        job.check_cancelled()
+        stats = None
+        if collect_stats:
+            job.progress("🔄 Counting operations...")
+            stats = AlgorithmStats()
+            self.algorithms.closest_pair(points, stats=stats)
+        profile_summary = None
+        if profile:
+            job.check_cancelled()
+            job.progress("🔄 Profiling...")
+            _, profile_summary = RunProfiler.profile_call(self.algorithms.closest_pair, points,
+                                                          name="closest_pair", output_dir=self.profiles_dir)
+        return points, min_dist, closest_pair, end_time - start_time, stats, profile_summary
+    
+    def show_stats(self, stats):
+        #appends operation counters to the statistics panel (left editable by the caller)
+        self.stats_text.insert(tk.END, f"\n📈 Operation counters:\n")
+        for line in stats.format_lines():
+            self.stats_text.insert(tk.END, line + "\n")
+    
+    def show_profile(self, profile_summary):
+        #appends a profiled run's hotspots and memory peak to the results tab
+        self.results_text.insert(tk.END, "\n" + RunProfiler.format_summary(profile_summary) + "\n")
+        self.results_text.see(tk.END)
+    
+    def show_closest_pair(self, result, cached=None):
+        #cached: the ResultCache entry the result came from, None for a fresh run
+        #the controls are re-enabled even when showing the result fails
+        status = "❌ Showing the Closest Pair result failed"
+        try:
+            self.show_closest_pair_result(result, cached)
+            status = ("✅ Closest Pair algorithm completed!" if cached is None
+                      else "✅ Closest Pair result loaded from cache")
+        finally:
+            self.finish_job(status)
+    
+    def show_closest_pair_result(self, result, cached):
+        points, min_dist, closest_pair, execution_time, stats, profile_summary = result
         
         self.results_text.insert(tk.END, f"📊 Results:\n")
-        self.results_text.insert(tk.END, f"   • Number of points: {len(self.current_points)}\n")
+        self.results_text.insert(tk.END, f"   • Number of points: {len(points)}\n")
+        if closest_pair is None:
+            #closest_pair gives (inf, None) below 2 points, there is nothing to draw or keep
+            self.results_text.insert(tk.END, f"   • Closest pair: none, at least 2 points are needed\n")
+            return
         self.results_text.insert(tk.END, f"   • Closest pair: {closest_pair[0]} and {closest_pair[1]}\n")
         self.results_text.insert(tk.END, f"   • Minimum distance: {min_dist:.4f}\n")
         self.results_text.insert(tk.END, f"   • Execution time: {execution_time:.6f} seconds\n")
+        if cached is not None:
+            self.results_text.insert(tk.END, f"   • ♻️ Cached result from {cached['created']} (timing of that run)\n")
+        if profile_summary is not None:
+            self.show_profile(profile_summary)
         
         #updating statistics
         self.stats_text.config(state=tk.NORMAL)
         self.stats_text.delete(1.0, tk.END)
         self.stats_text.insert(tk.END, f"📍 Algorithm: Closest Pair\n")
-        self.stats_text.insert(tk.END, f"📦 Input size: {len(self.current_points)} points\n")
+        self.stats_text.insert(tk.END, f"📦 Input size: {len(points)} points\n")
         self.stats_text.insert(tk.END, f"⏱️  Execution time: {execution_time:.6f} seconds\n")
         self.stats_text.insert(tk.END, f"📏 Minimum distance: {min_dist:.4f}\n")
+        if stats is not None:
+            self.show_stats(stats)
         self.stats_text.config(state=tk.DISABLED)
         
         #visualization
-        self.visualize_closest_pair(self.current_points, closest_pair)
-        self.status_var.set("✅ Closest Pair algorithm completed!")
-        self.results_text.see(tk.END)
-        self.progress.stop()
+        if cached is not None and cached["image"]:
+            self.show_viz_image(cached["image"])
+        else:
+            self.visualize_closest_pair(points, closest_pair)
+        if cached is None:
+            self.record_result("closest_pair", "auto", [execution_time], len(points),
+                               representation=type(points).__name__)
+            self.cache_store("closest_pair", "auto", {
+                "min_dist": float(min_dist),
+                "pair": np.asarray(closest_pair).tolist(),
+                "time": execution_time,
+            })
 
     def run_integer_multiplication(self):
         if not self.current_integers:
             return
         
         self.status_var.set("🔄 Running Karatsuba Multiplication...")
-        self.progress.start()
-        self.root.update()
         
         self.results_text.config(state=tk.NORMAL)
         self.results_text.insert(tk.END, "\n" + "═" * 60 + "\n")
         self.results_text.insert(tk.END, "🧮 KARATSUBA MULTIPLICATION ALGORITHM\n")
         self.results_text.insert(tk.END, "═" * 60 + "\n")
         
-        #test w/ first few pairs to avoid long computation
-        test_pairs = self.current_integers[:3]
+        self.multiplication_cases = []
+        self.multiplication_results = []
+        
+        cached = self.cache_lookup("multiply", "karatsuba")
+        if cached is not None:
+            payload = cached["payload"]
+            cases = [(i, *self.current_integers[i], tuple(timings), results_match)
+                     for i, timings, results_match in payload["cases"]]
+            for start in range(0, len(cases), self.MULTIPLY_CHUNK):
+                self.show_multiplication_chunk(cases[start:start + self.MULTIPLY_CHUNK])
+            self.show_multiplication_summary((payload["pair_count"], payload["mismatches"], payload["totals"],
+                                              None, None), cached)
+            return
         
-        total_karatsuba_time = 0
-        total_standard_time = 0
-        total_naive_time = 0
-        successful_pairs = 0
-        results_data = []
+        self.start_job(self.integer_multiplication_job, self.current_integers, self.stats_var.get(),
+                       self.profile_var.get(),
+                       on_partial=self.show_multiplication_chunk,
+                       on_done=self.show_multiplication_summary)
+    
+    def integer_multiplication_job(self, job, pairs, collect_stats, profile):
+        #runs on the worker thread: every multiplier of MULTIPLY_METHODS goes over the whole
+        #dataset through multiply_batch, one chunk at a time so a cancel is noticed between
+        #chunks; each chunk's cases go back through job.emit, must not touch any Tk widget
+        methods = self.MULTIPLY_METHODS
+        chunk_size = self.MULTIPLY_CHUNK
+        stats = AlgorithmStats() if collect_stats else None
+        mismatches = dict.fromkeys(methods, 0)
+        totals = dict.fromkeys(methods, 0.0)
+        for start in range(0, len(pairs), chunk_size):
+            chunk = pairs[start:start + chunk_size]
+            expected = [x * y for x, y in chunk]
+            products = []
+            timings = []
+            for method in methods:
+                job.check_cancelled()
+                job.progress(f"🔄 {method}: pairs {start + 1}-{start + len(chunk)} of {len(pairs)}...",
+                             start / len(pairs))
+                method_products, method_timings = self.algorithms.multiply_batch(chunk, method=method)
+                mismatches[method] += sum(1 for product, want in zip(method_products, expected) if product != want)
+                totals[method] += sum(method_timings)
+                products.append(method_products)
+                timings.append(method_timings)
+            if stats is not None:
+                for x, y in chunk:
+                    self.algorithms.karatsuba_multiply_counted(x, y, stats)
+            #(index, x, y, per method seconds, every product correct) of each pair
+            job.emit([(start + k, x, y, tuple(seconds[k] for seconds in timings),
+                       all(method_products[k] == expected[k] for method_products in products))
+                      for k, (x, y) in enumerate(chunk)])
+        job.check_cancelled()
+        profile_summary = None
+        if profile:
+            job.progress("🔄 Profiling...")
+            _, profile_summary = RunProfiler.profile_call(
+                lambda: self.algorithms.multiply_batch(pairs, method="karatsuba"),
+                name="karatsuba", output_dir=self.profiles_dir)
+        return len(pairs), mismatches, totals, stats, profile_summary
+    
+    def show_multiplication_chunk(self, cases):
+        #one multiply_batch chunk: its leading dataset pairs in full, then one line for it
+        for case in cases:
+            i, x, y, timings, results_match = case
+            self.multiplication_results.append((i, timings, results_match))
+            #storing data for visualization (karatsuba, standard, naive)
+            self.multiplication_cases.append(((x, y), timings))
+            if i < self.MULTIPLY_DETAIL_CASES:
+                self.show_multiplication_case(case)
+        if not cases:
+            return
+        wrong = sum(1 for case in cases if not case[4])
+        times = ", ".join(f"{method} {sum(case[3][m] for case in cases):.6f}s"
+                          for m, method in enumerate(self.MULTIPLY_METHODS))
+        verdict = "✅ all products correct" if wrong == 0 else f"❌ {wrong} wrong products"
+        self.results_text.insert(tk.END, f"📦 Pairs {cases[0][0]+1}-{cases[-1][0]+1}: {times} {verdict}\n")
+        self.results_text.see(tk.END)
+    
+    def show_multiplication_case(self, case):
+        i, x, y, timings, results_match = case
+        karatsuba_time, standard_time, naive_time = timings
+        
+        self.results_text.insert(tk.END, f"\n{'='*40}\n")
+        self.results_text.insert(tk.END, f"TEST CASE {i+1}\n")
+        self.results_text.insert(tk.END, f"{'='*40}\n")
+        self.results_text.insert(tk.END, f"Number 1 (X): {x}\n")
+        self.results_text.insert(tk.END, f"Number 2 (Y): {y}\n")
+        self.results_text.insert(tk.END, f"Digit lengths: {len(str(x))} and {len(str(y))}\n\n")
+        self.results_text.insert(tk.END, f"🧮 Running Karatsuba Algorithm... Done! ({karatsuba_time:.9f}s)\n")
+        self.results_text.insert(tk.END, f"➗ Running Standard Multiplication (Python's built-in)... Done! ({standard_time:.9f}s)\n")
+        self.results_text.insert(tk.END, f"📚 Running Naive Python Multiplication (for fair comparison)... Done! ({naive_time:.9f}s)\n\n")
+        
+        self.results_text.insert(tk.END, f"✅ Results match: {results_match}\n")
+        
+        if results_match:
+            self.results_text.insert(tk.END, f"🎯 Multiplication successful!\n")
+        else:
+            self.results_text.insert(tk.END, f"❌ ERROR: Results don't match!\n")
+        
+        #performance comparison - compare Karatsuba vs Naive Python (fair comparison)
+        self.results_text.insert(tk.END, f"\n📊 Performance Comparison:\n")
+        self.results_text.insert(tk.END, f"   • Python's built-in *: {standard_time:.9f}s (C-optimized)\n")
+        self.results_text.insert(tk.END, f"   • Naive Python: {naive_time:.9f}s (O(n²))\n")
+        self.results_text.insert(tk.END, f"   • Karatsuba Python: {karatsuba_time:.9f}s (O(n^1.585))\n\n")
+        
+        # Compare Karatsuba vs Naive (fair comparison - both in Python)
+        if karatsuba_time > 0 and naive_time > 0:
+            karatsuba_vs_naive = naive_time / karatsuba_time
+            if karatsuba_vs_naive > 1:
+                self.results_text.insert(tk.END, f"✅ Karatsuba is {karatsuba_vs_naive:.2f}x faster than Naive Python\n")
+            elif karatsuba_vs_naive < 1:
+                self.results_text.insert(tk.END, f"⚠️  Naive is {1/karatsuba_vs_naive:.2f}x faster than Karatsuba\n")
+                self.results_text.insert(tk.END, f"   (For {len(str(x))}-digit numbers, Python overhead dominates)\n")
+                self.results_text.insert(tk.END, f"   (Karatsuba's advantage appears at 500+ digits)\n")
+            else:
+                self.results_text.insert(tk.END, f"⚡ Karatsuba and Naive are equally fast\n")
         
-        for i, (x, y) in enumerate(test_pairs):
-            try:
-                self.results_text.insert(tk.END, f"\n{'='*40}\n")
-                self.results_text.insert(tk.END, f"TEST CASE {i+1}\n")
-                self.results_text.insert(tk.END, f"{'='*40}\n")
-                self.results_text.insert(tk.END, f"Number 1 (X): {x}\n")
-                self.results_text.insert(tk.END, f"Number 2 (Y): {y}\n")
-                self.results_text.insert(tk.END, f"Digit lengths: {len(str(x))} and {len(str(y))}\n\n")
-                
-                #karatsuba multiplication - use timeit with many iterations for accuracy
-                self.results_text.insert(tk.END, "🧮 Running Karatsuba Algorithm... ")
-                self.results_text.update()
-                # Run many times to get accurate timing (Karatsuba is slower, so fewer iterations needed)
-                karatsuba_timer = timeit.Timer(lambda: self.algorithms.karatsuba_multiply(x, y))
-                # Run 50 times, repeat 3 times, take minimum
-                karatsuba_times = karatsuba_timer.repeat(repeat=3, number=50)
-                karatsuba_time = min(karatsuba_times) / 50.0  # Average per operation
-                result_karatsuba = self.algorithms.karatsuba_multiply(x, y)
-                total_karatsuba_time += karatsuba_time
-                self.results_text.insert(tk.END, f"Done! ({karatsuba_time:.9f}s)\n")
-                
-                #standard multiplication - use timeit with MANY iterations for accuracy
-                self.results_text.insert(tk.END, "➗ Running Standard Multiplication (Python's built-in)... ")
-                self.results_text.update()
-                # Run MANY times since standard is extremely fast - need to measure over longer period
-                standard_timer = timeit.Timer(lambda: self.algorithms.standard_multiply(x, y))
-                # Run 10,000 times, repeat 3 times, take minimum - this ensures we measure over a meaningful duration
-                standard_times = standard_timer.repeat(repeat=3, number=10000)
-                standard_time = min(standard_times) / 10000.0  # Average per operation
-                result_standard = self.algorithms.standard_multiply(x, y)
-                
-                # Also test naive Python multiplication for fair comparison
-                self.results_text.insert(tk.END, "📚 Running Naive Python Multiplication (for fair comparison)... ")
-                self.results_text.update()
-                naive_timer = timeit.Timer(lambda: self.algorithms.naive_python_multiply(x, y))
-                # Run fewer times since naive is slower
-                naive_times = naive_timer.repeat(repeat=3, number=10)
-                naive_time = min(naive_times) / 10.0  # Average per operation
-                result_naive = self.algorithms.naive_python_multiply(x, y)
-                total_standard_time += standard_time
-                total_naive_time += naive_time
-                self.results_text.insert(tk.END, f"Done! ({standard_time:.9f}s)\n")
-                self.results_text.insert(tk.END, f"Done! ({naive_time:.9f}s)\n\n")
-                
-                #verifying results
-                results_match = (result_karatsuba == result_standard == result_naive)
-                self.results_text.insert(tk.END, f"✅ Results match: {results_match}\n")
-                
-                if results_match:
-                    self.results_text.insert(tk.END, f"🎯 Multiplication successful!\n")
-                else:
-                    self.results_text.insert(tk.END, f"❌ ERROR: Results don't match!\n")
-                
-                #performance comparison - compare Karatsuba vs Naive Python (fair comparison)
-                self.results_text.insert(tk.END, f"\n📊 Performance Comparison:\n")
-                self.results_text.insert(tk.END, f"   • Python's built-in *: {standard_time:.9f}s (C-optimized)\n")
-                self.results_text.insert(tk.END, f"   • Naive Python: {naive_time:.9f}s (O(n²))\n")
-                self.results_text.insert(tk.END, f"   • Karatsuba Python: {karatsuba_time:.9f}s (O(n^1.585))\n\n")
-                
-                # Compare Karatsuba vs Naive (fair comparison - both in Python)
-                if karatsuba_time > 0 and naive_time > 0:
-                    karatsuba_vs_naive = naive_time / karatsuba_time
-                    if karatsuba_vs_naive > 1:
-                        self.results_text.insert(tk.END, f"✅ Karatsuba is {karatsuba_vs_naive:.2f}x faster than Naive Python\n")
-                    elif karatsuba_vs_naive < 1:
-                        self.results_text.insert(tk.END, f"⚠️  Naive is {1/karatsuba_vs_naive:.2f}x faster than Karatsuba\n")
-                        self.results_text.insert(tk.END, f"   (For {len(str(x))}-digit numbers, Python overhead dominates)\n")
-                        self.results_text.insert(tk.END, f"   (Karatsuba's advantage appears at 500+ digits)\n")
-                    else:
-                        self.results_text.insert(tk.END, f"⚡ Karatsuba and Naive are equally fast\n")
-                
-                # Compare Python's built-in vs Karatsuba (unfair but informative)
-                if karatsuba_time > 0 and standard_time > 0:
-                    builtin_vs_karatsuba = standard_time / karatsuba_time
-                    self.results_text.insert(tk.END, f"\nℹ️  Note: Python's built-in * is {1/builtin_vs_karatsuba if builtin_vs_karatsuba > 0 else 'much'}x faster\n")
-                    self.results_text.insert(tk.END, f"   (It's C-optimized and may use Karatsuba internally)\n")
-                
-                #storing data for visualization (karatsuba, standard, naive)
-                results_data.append((karatsuba_time, standard_time, naive_time))
-                successful_pairs += 1
-                
-            except Exception as e:
-                self.results_text.insert(tk.END, f"💥 Error processing pair {i+1}: {str(e)}\n")
-                continue
+        # Compare Python's built-in vs Karatsuba (unfair but informative)
+        if karatsuba_time > 0 and standard_time > 0:
+            builtin_vs_karatsuba = standard_time / karatsuba_time
+            self.results_text.insert(tk.END, f"\nℹ️  Note: Python's built-in * is {1/builtin_vs_karatsuba if builtin_vs_karatsuba > 0 else 'much'}x faster\n")
+            self.results_text.insert(tk.END, f"   (It's C-optimized and may use Karatsuba internally)\n")
+    
+    def show_multiplication_summary(self, summary, cached=None):
+        #cached: the ResultCache entry the summary came from, None for a fresh run
+        #the controls are re-enabled even when showing the summary fails
+        status = "❌ Showing the Karatsuba results failed"
+        try:
+            self.show_multiplication_results(summary, cached)
+            status = ("✅ Karatsuba multiplication completed!" if cached is None
+                      else "✅ Karatsuba result loaded from cache")
+        finally:
+            self.finish_job(status)
+    
+    def show_multiplication_results(self, summary, cached):
+        pair_count, mismatches, totals, stats, profile_summary = summary
+        successful_pairs = len(self.multiplication_cases)
+        
+        self.results_text.insert(tk.END, f"\n{'='*40}\n")
+        self.results_text.insert(tk.END, f"BATCH VALIDATION ({pair_count} pairs)\n")
+        self.results_text.insert(tk.END, f"{'='*40}\n")
+        for method in self.MULTIPLY_METHODS:
+            mark = "✅" if mismatches[method] == 0 else "❌"
+            self.results_text.insert(tk.END, f"{mark} {method}: {pair_count - mismatches[method]}/{pair_count} "
+                                             f"correct products, total {totals[method]:.6f}s\n")
+        if cached is not None:
+            self.results_text.insert(tk.END, f"♻️ Cached result from {cached['created']} (timings of that run)\n")
+        else:
+            for method in self.MULTIPLY_METHODS:
+                self.record_result("multiply", method, [totals[method]], pair_count, mismatches[method] == 0,
+                                   representation=type(self.current_integers).__name__)
+        if profile_summary is not None:
+            self.show_profile(profile_summary)
         
         #visualisation
-        if successful_pairs > 0:
-            self.visualize_integer_multiplication(test_pairs[:successful_pairs], results_data)
+        if cached is not None and cached["image"]:
+            self.show_viz_image(cached["image"])
+        elif successful_pairs > 0:
+            self.visualize_integer_multiplication([pair for pair, _ in self.multiplication_cases],
+                                                  [timings for _, timings in self.multiplication_cases])
         
         #updating statistics
         self.stats_text.config(state=tk.NORMAL)
         self.stats_text.delete(1.0, tk.END)
         self.stats_text.insert(tk.END, f"Algorithm: Karatsuba Multiplication\n")
-        self.stats_text.insert(tk.END, f"Test cases completed: {successful_pairs}/{len(test_pairs)}\n")
+        self.stats_text.insert(tk.END, f"Pairs completed: {successful_pairs}/{pair_count}\n")
         
         if successful_pairs > 0:
-            avg_karatsuba = total_karatsuba_time / successful_pairs
-            avg_standard = total_standard_time / successful_pairs
-            avg_naive = total_naive_time / successful_pairs
+            avg_karatsuba = sum(t[0] for _, t in self.multiplication_cases) / successful_pairs
+            avg_standard = sum(t[1] for _, t in self.multiplication_cases) / successful_pairs
+            avg_naive = sum(t[2] for _, t in self.multiplication_cases) / successful_pairs
             
             self.stats_text.insert(tk.END, f"\nAverage Execution Times:\n")
             self.stats_text.insert(tk.END, f"  • Python's built-in *: {avg_standard:.9f}s (C-optimized)\n")
@@ -755,33 +975,141 @@ class DivideConquerGUI:
                 self.stats_text.insert(tk.END, f"\nNote: Python's built-in * is {1/builtin_vs_karatsuba if builtin_vs_karatsuba > 0 else 'much'}x faster\n")
                 self.stats_text.insert(tk.END, f"(C-optimized, may use Karatsuba internally)\n")
         
+        if stats is not None:
+            self.show_stats(stats)
         self.stats_text.config(state=tk.DISABLED)
-        self.status_var.set("✅ Karatsuba multiplication completed!")
-        self.results_text.see(tk.END)
-        self.progress.stop()
+        if cached is None:
+            self.cache_store("multiply", "karatsuba", {
+                "cases": self.multiplication_results,
+                "pair_count": pair_count,
+                "mismatches": mismatches,
+                "totals": totals,
+            }, successful_pairs > 0)
 
-    def visualize_closest_pair(self, points, closest_pair):
-        #clear previous visualization - clear the canvas frame, not the main frame
-        for widget in self.viz_canvas_frame.winfo_children():
-            widget.destroy()
+    def record_result(self, algorithm, engine, times, size, correct=None, representation=None):
+        #keep GUI timings in the results store so runs can be compared later
+        #they go under their own "<engine>-gui" key, a single interactive timing must not
+        #become the baseline or candidate of a benchmark run of the same engine
+        if not self.current_file:
+            return
+        try:
+            store = ResultsStore(self.results_db)
+            try:
+                store.record(algorithm, f"{engine}-gui", self.current_hash, times,
+                             os.path.basename(self.current_file), size, correct,
+                             representation=representation)
+            finally:
+                store.close()
+        except Exception as e:
+            print(f"Warning: could not record results: {e}")
+
+    def cache_lookup(self, algorithm, engine):
+        #cached entry for the loaded dataset, None on a miss or when the run has to happen
+        #anyway (operation counters or profiling requested)
+        if not self.current_hash or self.stats_var.get() or self.profile_var.get():
+            return None
+        try:
+            cache = ResultCache(self.cache_db)
+            try:
+                return cache.get(self.current_hash, algorithm, engine)
+            finally:
+                cache.close()
+        except Exception as e:
+            print(f"Warning: could not read the result cache: {e}")
+            return None
+    
+    def cache_store(self, algorithm, engine, payload, with_image=True):
+        #keeps a fresh run, plus the figure just drawn as PNG, for the next run on this dataset
+        if not self.current_hash:
+            return
+        try:
+            image = None
+            if with_image and self.viz_figure is not None:
+                buffer = io.BytesIO()
+                self.viz_figure.savefig(buffer, format='png', facecolor=self.viz_figure.get_facecolor())
+                image = buffer.getvalue()
+            cache = ResultCache(self.cache_db)
+            try:
+                cache.put(self.current_hash, algorithm, engine, payload, image)
+            finally:
+                cache.close()
+        except Exception as e:
+            print(f"Warning: could not write the result cache: {e}")
+    
+    def show_viz_image(self, png):
+        #shows a cached visualisation in place of the matplotlib canvas
+        image = tk.PhotoImage(data=base64.b64encode(png))
+        if self.viz_figure_canvas is not None:
+            self.viz_figure_canvas.get_tk_widget().pack_forget()
+        if self.viz_image_label is None:
+            self.viz_image_label = tk.Label(self.viz_canvas_frame, bg='#000000', borderwidth=0)
+        self.viz_image_label.configure(image=image)
+        self.viz_image_label.image = image  #tk only keeps a weak reference
+        self.viz_image_label.pack(fill=tk.BOTH, expand=True)
+        self.viz_canvas.update_idletasks()
+        self.viz_canvas.configure(scrollregion=self.viz_canvas.bbox("all"))
+    
+    def get_viz_figure(self, figsize, dpi=100):
+        #one figure and canvas are reused by every visualisation and cleared between runs,
+        #creating a new pyplot figure per run kept every old one alive
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        if self.viz_figure is None:
+            self.viz_figure = Figure(figsize=figsize, dpi=dpi)
+            self.viz_figure_canvas = FigureCanvasTkAgg(self.viz_figure, self.viz_canvas_frame)
+            self.viz_figure_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        else:
+            self.viz_figure.clf()
+            self.viz_figure.set_dpi(dpi)
+            self.viz_figure.set_size_inches(*figsize)
+            self.viz_figure_canvas.get_tk_widget().configure(width=int(figsize[0] * dpi),
+                                                             height=int(figsize[1] * dpi))
+            if self.viz_image_label is not None:
+                #a cached image was shown last, switch back to the live canvas
+                self.viz_image_label.pack_forget()
+                self.viz_figure_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.viz_figure.patch.set_facecolor('#000000')  # Black background
+        return self.viz_figure
+    
+    def show_viz_figure(self):
+        self.viz_figure_canvas.draw()
         
+        # Update scroll region after canvas is drawn
+        self.viz_canvas.update_idletasks()
+        self.viz_canvas.configure(scrollregion=self.viz_canvas.bbox("all"))
+    
+    def visualize_closest_pair(self, points, closest_pair):
         #matplotlib figure
-        fig, ax = plt.subplots(figsize=(10, 7))
-        fig.patch.set_facecolor('#000000')  # Black background
+        fig = self.get_viz_figure((10, 7))
+        ax = fig.add_subplot()
         ax.set_facecolor('#1a1a1a')  # Very dark grey
         
-        #extract coordinates
-        x_coords = [p[0] for p in points]
-        y_coords = [p[1] for p in points]
-        
-        #plot all points - use white/grey instead of blue
-        ax.scatter(x_coords, y_coords, color='#ffffff', alpha=0.7, s=50, label='All Points')
-        
-        #highlight closest pair
-        cp_x = [closest_pair[0][0], closest_pair[1][0]]
-        cp_y = [closest_pair[0][1], closest_pair[1][1]]
-        ax.scatter(cp_x, cp_y, color='#e74c3c', s=150, label='Closest Pair', zorder=5)
-        ax.plot(cp_x, cp_y, 'r-', linewidth=3, alpha=0.8)
+        #extract coordinates, a PointArray already holds them as columns
+        if isinstance(points, PointArray):
+            x_coords, y_coords = points.numpy_columns()
+        else:
+            coords = np.asarray(points)
+            x_coords = coords[:, 0]
+            y_coords = coords[:, 1]
+        
+        if len(x_coords) <= self.SCATTER_LIMIT:
+            #plot all points - use white/grey instead of blue, smaller markers as the set grows
+            size = 50 if len(x_coords) <= 1000 else max(50000 / len(x_coords), 2)
+            ax.scatter(x_coords, y_coords, color='#ffffff', alpha=0.7, s=size, label='All Points')
+        else:
+            #one marker per point takes far longer to draw than the algorithm takes to run,
+            #show a log scaled 2D histogram of the points instead
+            counts, x_edges, y_edges = np.histogram2d(x_coords, y_coords, bins=self.DENSITY_BINS)
+            ax.imshow(np.log1p(counts.T), origin='lower', cmap='gray', interpolation='nearest', aspect='auto',
+                      extent=(x_edges[0], x_edges[-1], y_edges[0], y_edges[-1]))
+            ax.scatter([], [], color='#ffffff', marker='s', label=f'Point density ({len(x_coords)} points)')
+        
+        #highlight closest pair, drawn on top of the points or the density raster
+        if closest_pair:
+            cp_x = [closest_pair[0][0], closest_pair[1][0]]
+            cp_y = [closest_pair[0][1], closest_pair[1][1]]
+            ax.scatter(cp_x, cp_y, color='#e74c3c', s=150, label='Closest Pair', zorder=5)
+            ax.plot(cp_x, cp_y, 'r-', linewidth=3, alpha=0.8, zorder=5)
         
         #styling
         ax.set_xlabel('X Coordinate', color='white', fontsize=12)
@@ -792,23 +1120,12 @@ class DivideConquerGUI:
         ax.tick_params(colors='white')
         
         #embed in tkinter - place in scrollable canvas frame
-        canvas = FigureCanvasTkAgg(fig, self.viz_canvas_frame)
-        canvas.draw()
-        canvas_widget = canvas.get_tk_widget()
-        canvas_widget.pack(fill=tk.BOTH, expand=True)
-        
-        # Update scroll region after canvas is drawn
-        self.viz_canvas.update_idletasks()
-        self.viz_canvas.configure(scrollregion=self.viz_canvas.bbox("all"))
+        self.show_viz_figure()
 
     def visualize_integer_multiplication(self, test_pairs, results):
-        #clear previous visualisation - clear the canvas frame, not the main frame
-        for widget in self.viz_canvas_frame.winfo_children():
-            widget.destroy()
-        
         # Increase figure size significantly for better visibility - taller to prevent squeezing
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(18, 9), dpi=100)
-        fig.patch.set_facecolor('#000000')  # Black background
+        fig = self.get_viz_figure((18, 9))
+        ax1, ax2 = fig.subplots(1, 2)
         
         for ax in [ax1, ax2]:
             ax.set_facecolor('#1a1a1a')  # Very dark grey instead of blue-grey
@@ -828,20 +1145,25 @@ class DivideConquerGUI:
             standard_times.append(standard_time)
             naive_times.append(naive_time)
         
+        #a whole dataset has too many cases for markers and per-case labels
+        labelled = len(digit_lengths) <= self.MULTIPLY_LABELLED_CASES
+        marker_scale = 1 if labelled else 0
+        
         # Plot all three algorithms
         ax1.plot(range(len(digit_lengths)), karatsuba_times, 'o-', color='#2ecc71', 
-                label='Karatsuba (O(n^1.585))', linewidth=3, markersize=10, markerfacecolor='#27ae60')
+                label='Karatsuba (O(n^1.585))', linewidth=3, markersize=10 * marker_scale, markerfacecolor='#27ae60')
         ax1.plot(range(len(digit_lengths)), naive_times, 's-', color='#f39c12', 
-                label='Naive Python (O(n²))', linewidth=3, markersize=10, markerfacecolor='#e67e22')
+                label='Naive Python (O(n²))', linewidth=3, markersize=10 * marker_scale, markerfacecolor='#e67e22')
         ax1.plot(range(len(digit_lengths)), standard_times, '^-', color='#e74c3c', 
-                label="Python's built-in * (C-optimized)", linewidth=2, markersize=8, markerfacecolor='#c0392b', alpha=0.7)
+                label="Python's built-in * (C-optimized)", linewidth=2, markersize=8 * marker_scale, markerfacecolor='#c0392b', alpha=0.7)
         
         ax1.set_xlabel('Test Case', color='white', fontsize=12)
         ax1.set_ylabel('Execution Time (seconds)', color='white', fontsize=12)
         ax1.set_title('Algorithm Performance Comparison', color='white', fontsize=14, pad=20)
-        ax1.set_xticks(range(len(digit_lengths)))
-        ax1.set_xticklabels([f'Case {i+1}\n({digit_lengths[i]}d)' for i in range(len(digit_lengths))], 
-                           color='white')
+        if labelled:
+            ax1.set_xticks(range(len(digit_lengths)))
+            ax1.set_xticklabels([f'Case {i+1}\n({digit_lengths[i]}d)' for i in range(len(digit_lengths))], 
+                               color='white')
         ax1.legend(facecolor='#000000', edgecolor='white', labelcolor='white', fontsize=10)
         ax1.grid(True, alpha=0.3, color='white')
         
@@ -855,16 +1177,18 @@ class DivideConquerGUI:
                 speedups.append(0)  # Can't calculate if times are too small
         
         colors = ['#27ae60' if speedup > 1 else '#e74c3c' for speedup in speedups]
-        bars = ax2.bar(range(len(speedups)), speedups, color=colors, alpha=0.8, edgecolor='white', width=0.6)
+        bars = ax2.bar(range(len(speedups)), speedups, color=colors, alpha=0.8,
+                       edgecolor='white' if labelled else None, width=0.6 if labelled else 1.0)
         
         ax2.set_xlabel('Test Case', color='white', fontsize=12)
         ax2.set_ylabel('Speedup Factor (x times)', color='white', fontsize=12)
         ax2.set_title('Karatsuba Speedup Over Naive Python', color='white', fontsize=14, pad=20)
-        ax2.set_xticks(range(len(speedups)))
-        ax2.set_xticklabels([f'Case {i+1}' for i in range(len(speedups))], color='white')
+        if labelled:
+            ax2.set_xticks(range(len(speedups)))
+            ax2.set_xticklabels([f'Case {i+1}' for i in range(len(speedups))], color='white')
         
         #add value labels on bars
-        for i, v in enumerate(speedups):
+        for i, v in enumerate(speedups if labelled else []):
             if v > 0:
                 color = 'white'
                 label_text = f'{v:.2f}x' if v >= 0.01 else f'{v:.3f}x'
@@ -880,17 +1204,10 @@ class DivideConquerGUI:
         ax2.grid(True, alpha=0.3, color='white')
         
         # Add more padding and adjust layout to prevent text cutoff
-        plt.tight_layout(pad=4.0, h_pad=3.0, w_pad=3.0)
+        fig.tight_layout(pad=4.0, h_pad=3.0, w_pad=3.0)
         
         #embed in tkinter - place in scrollable canvas frame
-        canvas = FigureCanvasTkAgg(fig, self.viz_canvas_frame)
-        canvas.draw()
-        canvas_widget = canvas.get_tk_widget()
-        canvas_widget.pack(fill=tk.BOTH, expand=True)
-        
-        # Update scroll region after canvas is drawn
-        self.viz_canvas.update_idletasks()
-        self.viz_canvas.configure(scrollregion=self.viz_canvas.bbox("all"))
+        self.show_viz_figure()
 
 if __name__ == "__main__":
     root = tk.Tk()
@@ -0,0 +1,49 @@
+class AlgorithmStats:
+    #operation counters and per recursion level histograms for one or more runs
+    #pass one to the instrumented engines (closest_pair(points, stats=...) and
+    #karatsuba_multiply_counted) to fill it in; the plain engines never take one,
+    #so leaving stats out runs exactly the uninstrumented code
+    def __init__(self):
+        self.counters = {}
+        #name -> {level: [count, total, max]}
+        self.levels = {}
+    
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+    
+    def maximum(self, name, value):
+        #keeps the largest value seen for name
+        if value > self.counters.get(name, value - 1):
+            self.counters[name] = value
+    
+    def record(self, name, level, value):
+        #adds one observation of value to the histogram of name at a recursion level
+        per_level = self.levels.setdefault(name, {})
+        entry = per_level.get(level)
+        if entry is None:
+            per_level[level] = [1, value, value]
+        else:
+            entry[0] += 1
+            entry[1] += value
+            if value > entry[2]:
+                entry[2] = value
+    
+    def as_dict(self):
+        #JSON friendly form: {"counters": {...}, "levels": {name: [{"level", "count", "total", "max"}, ...]}}
+        return {
+            "counters": dict(sorted(self.counters.items())),
+            "levels": {
+                name: [{"level": level, "count": count, "total": total, "max": peak}
+                       for level, (count, total, peak) in sorted(per_level.items())]
+                for name, per_level in sorted(self.levels.items())
+            },
+        }
+    
+    def format_lines(self):
+        #human readable summary, one counter per line then one table per histogram
+        lines = [f"  • {name.replace('_', ' ')}: {value}" for name, value in sorted(self.counters.items())]
+        for name, per_level in sorted(self.levels.items()):
+            lines.append(f"\n{name.replace('_', ' ').capitalize()} per level (count / avg / max):")
+            for level, (count, total, peak) in sorted(per_level.items()):
+                lines.append(f"  {level:3d}: {count:8d} / {total / count:10.1f} / {peak}")
+        return lines
@@ -0,0 +1,116 @@
+import queue
+import threading
+
+class JobCancelled(Exception):
+    #raised inside a job by check_cancelled() once cancel() was requested
+    pass
+
+class Job:
+    #one algorithm run on a background thread, talks to the Tk thread only through a queue
+    #the job function is called as func(job, *args) and can report back with
+    #job.progress(message, fraction) and job.emit(partial_result)
+    def __init__(self, func, args):
+        self.func = func
+        self.args = args
+        self.events = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+    
+    def start(self):
+        self.thread.start()
+    
+    def run(self):
+        try:
+            result = self.func(self, *self.args)
+        except JobCancelled:
+            self.events.put(("cancelled", None))
+        except Exception as e:
+            self.events.put(("error", e))
+        else:
+            self.events.put(("done", result))
+    
+    def progress(self, message=None, fraction=None):
+        self.events.put(("progress", (message, fraction)))
+    
+    def emit(self, partial):
+        self.events.put(("partial", partial))
+    
+    def cancel(self):
+        self.cancel_event.set()
+    
+    def cancelled(self):
+        return self.cancel_event.is_set()
+    
+    def check_cancelled(self):
+        #call between steps of a long job, stops it if the user cancelled
+        if self.cancel_event.is_set():
+            raise JobCancelled()
+
+class JobRunner:
+    #runs one Job at a time off the Tk main loop and delivers its events to callbacks
+    #on the main thread, polling the job queue with root.after every interval ms
+    #cancel() asks the job to stop at its next check_cancelled(), the runner stays busy
+    #until the job thread has exited, then drops its result and reports on_cancel
+    def __init__(self, root, interval=50):
+        self.root = root
+        self.interval = interval
+        self.job = None
+        self.callbacks = {}
+    
+    def busy(self):
+        return self.job is not None
+    
+    def submit(self, func, *args, on_progress=None, on_partial=None, on_done=None,
+               on_error=None, on_cancel=None):
+        if self.job is not None:
+            raise RuntimeError("A job is already running")
+        self.job = Job(func, args)
+        self.callbacks = {
+            "progress": on_progress,
+            "partial": on_partial,
+            "done": on_done,
+            "error": on_error,
+            "cancelled": on_cancel,
+        }
+        self.job.start()
+        self.root.after(self.interval, self.poll, self.job)
+        return self.job
+    
+    def cancel(self):
+        #returns True when a running job was asked to stop
+        if self.job is None or self.job.cancelled():
+            return False
+        self.job.cancel()
+        return True
+    
+    def poll(self, job):
+        #a finished or replaced job is no longer polled, the next poll is scheduled
+        #even when a callback raises, so the runner never stays busy forever
+        if job is not self.job:
+            return
+        try:
+            while True:
+                try:
+                    kind, payload = job.events.get_nowait()
+                except queue.Empty:
+                    break
+                if kind in ("done", "error", "cancelled"):
+                    #the terminal event is the job thread's last step, so this join is
+                    #immediate, only once the thread is gone is the runner free again
+                    job.thread.join()
+                    self.job = None
+                    if job.cancelled():
+                        kind, payload = "cancelled", None
+                    callback = self.callbacks.get(kind)
+                    if callback:
+                        callback(payload)
+                    return
+                callback = self.callbacks.get(kind)
+                if callback and not job.cancelled():
+                    if kind == "progress":
+                        callback(*payload)
+                    else:
+                        callback(payload)
+        finally:
+            if self.job is job:
+                self.root.after(self.interval, self.poll, job)
@@ -0,0 +1,315 @@
+import mmap
+import os
+import struct
+import sys
+
+from point_array import PointArray
+
+#numpy is optional here, without it points are loaded as lists of tuples
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+class DatasetLoader:
+    #bytes read from disk per chunk
+    CHUNK_SIZE = 1 << 22
+    #lines inspected when sniffing the dataset kind
+    SNIFF_LINES = 64
+    
+    #binary datasets: a 16 byte header (magic, version, kind, value type, record count)
+    #then either count * 2 coordinates of that type, or count pairs of integers each
+    #stored as a signed int64 limb count (sign = sign of the value) plus 32-bit limbs
+    BINARY_MAGIC = b'DCDS'
+    BINARY_VERSION = 1
+    BINARY_HEADER = struct.Struct('<4sBBHQ')
+    BINARY_KINDS = {1: "points", 2: "integers"}
+    BINARY_DTYPES = {0: '<i4', 1: '<i8', 2: '<f8', 3: 'limbs'}
+    #struct codes of the coordinate types, for reading and writing without numpy
+    BINARY_STRUCT_CODES = {'<i4': 'i', '<i8': 'q', '<f8': 'd'}
+    
+    @staticmethod
+    def is_binary(filename):
+        with open(filename, 'rb') as f:
+            return f.read(len(DatasetLoader.BINARY_MAGIC)) == DatasetLoader.BINARY_MAGIC
+    
+    @staticmethod
+    def read_binary_header(filename):
+        #(kind, dtype, count) of a binary dataset
+        with open(filename, 'rb') as f:
+            raw = f.read(DatasetLoader.BINARY_HEADER.size)
+        if len(raw) < DatasetLoader.BINARY_HEADER.size:
+            raise ValueError(f"Truncated binary dataset: {os.path.basename(filename)}")
+        magic, version, kind, dtype, count = DatasetLoader.BINARY_HEADER.unpack(raw)
+        if magic != DatasetLoader.BINARY_MAGIC or version != DatasetLoader.BINARY_VERSION:
+            raise ValueError(f"Not a version {DatasetLoader.BINARY_VERSION} binary dataset: {os.path.basename(filename)}")
+        return DatasetLoader.BINARY_KINDS[kind], DatasetLoader.BINARY_DTYPES[dtype], count
+    
+    @staticmethod
+    def tokens(text):
+        #the values of "x,y", "x, y" or "x y" lines, commas count as whitespace
+        return text.replace(',', ' ').split()
+    
+    @staticmethod
+    def check_rows(flat, message):
+        #raises ValueError(message) unless every line of flat (separators normalised) is
+        #blank or holds two values, the sniffed lines alone do not vouch for the rest
+        #of the file and a flattened "3,4,5" / "6" would otherwise pair up as (3,4),(5,6)
+        if NUMPY_AVAILABLE:
+            #a value starts where a non-blank byte follows a blank one, counted per line
+            raw = np.frombuffer(flat.encode(), dtype=np.uint8)
+            blank = raw <= 32
+            starts = ~blank
+            starts[1:] &= blank[:-1]
+            counts = np.bincount(np.cumsum(raw == 10, dtype=np.int32)[starts])
+            if np.all((counts == 0) | (counts == 2)):
+                return
+        #without numpy this loop is the check, with it it only finds the line to report
+        for line in flat.splitlines():
+            if len(line.split()) not in (0, 2):
+                raise ValueError(f"{message}: {line.strip()[:80]}")
+    
+    @staticmethod
+    def detect_format(filename):
+        #"points" or "integers", decided from the file content where it can be:
+        #every line must hold exactly two values, a float value means points and a value
+        #beyond int64 means integer operands (point coordinates are int64 or float64)
+        #whole numbers that fit int64 fit both kinds, then a file name that says
+        #"integers" settles it and anything else is read as points
+        #binary files carry the kind in the header, load(kind=...) skips the sniffing
+        if DatasetLoader.is_binary(filename):
+            return DatasetLoader.read_binary_header(filename)[0]
+        seen = 0
+        with open(filename, 'r') as f:
+            for line in f:
+                values = DatasetLoader.tokens(line)
+                if not values:
+                    continue
+                if len(values) != 2:
+                    raise ValueError(f"Unrecognised dataset line: {line.strip()[:80]}")
+                for value in values:
+                    if any(c in value for c in '.eE'):
+                        return "points"
+                    digits = value.lstrip('+-')
+                    if not digits.isdigit():
+                        raise ValueError(f"Unrecognised dataset line: {line.strip()[:80]}")
+                    #the length check first, int() of a long operand is not free
+                    if len(digits) > 19 or not -2**63 <= int(value) < 2**63:
+                        return "integers"
+                seen += 1
+                if seen >= DatasetLoader.SNIFF_LINES:
+                    break
+        if seen == 0:
+            raise ValueError(f"Dataset is empty: {os.path.basename(filename)}")
+        return "integers" if "integer" in os.path.basename(filename).lower() else "points"
+    
+    @staticmethod
+    def iter_text_chunks(filename, chunk_size=None):
+        #yields blocks of whole lines, read chunk_size bytes at a time
+        chunk_size = chunk_size or DatasetLoader.CHUNK_SIZE
+        remainder = ''
+        with open(filename, 'r') as f:
+            while True:
+                block = f.read(chunk_size)
+                if not block:
+                    break
+                block = remainder + block
+                cut = block.rfind('\n')
+                if cut < 0:
+                    remainder = block
+                    continue
+                remainder = block[cut + 1:]
+                yield block[:cut + 1]
+        if remainder.strip():
+            yield remainder
+    
+    @staticmethod
+    def parse_points(text):
+        #one block of "x,y" lines -> (k, 2) array (list of tuples without numpy)
+        #separators are normalised first (see tokens), so "x, y" and "x y" lines work too
+        flat = text.replace(',', ' ')
+        DatasetLoader.check_rows(flat, "Every point needs an x and a y value")
+        if NUMPY_AVAILABLE:
+            if not flat.strip():
+                return np.empty((0, 2), dtype=np.int64)
+            dtype = np.float64 if any(c in flat for c in '.eE') else np.int64
+            return np.fromstring(flat, dtype=dtype, sep=' ').reshape(-1, 2)
+        values = flat.split()
+        values = [float(v) if any(c in v for c in '.eE') else int(v) for v in values]
+        return list(zip(values[0::2], values[1::2]))
+    
+    @staticmethod
+    def parse_integers(text):
+        #one block of "a,b" lines -> list of (a, b) int tuples
+        flat = text.replace(',', ' ')
+        DatasetLoader.check_rows(flat, "Every line needs two integers")
+        values = [int(v) for v in flat.split()]
+        return list(zip(values[0::2], values[1::2]))
+    
+    @staticmethod
+    def iter_chunks(filename, kind=None, chunk_size=None):
+        #generator over parsed chunks of a dataset: arrays of points or lists of pairs
+        kind = kind or DatasetLoader.detect_format(filename)
+        if DatasetLoader.is_binary(filename):
+            yield from DatasetLoader.iter_binary_chunks(filename, chunk_size)
+            return
+        parse = DatasetLoader.parse_points if kind == "points" else DatasetLoader.parse_integers
+        for text in DatasetLoader.iter_text_chunks(filename, chunk_size):
+            yield parse(text)
+    
+    @staticmethod
+    def load(filename, kind=None, chunk_size=None, compact=False):
+        #whole dataset as (kind, data), points come back as one (N, 2) array with numpy
+        #compact=True returns points as a PointArray (x and y columns) instead
+        kind = kind or DatasetLoader.detect_format(filename)
+        if DatasetLoader.is_binary(filename):
+            return DatasetLoader.load_binary(filename, compact)
+        if kind == "points" and compact:
+            return kind, PointArray.from_chunks(DatasetLoader.iter_chunks(filename, kind, chunk_size))
+        chunks = list(DatasetLoader.iter_chunks(filename, kind, chunk_size))
+        if kind == "points" and NUMPY_AVAILABLE:
+            if not chunks:
+                return kind, np.empty((0, 2), dtype=np.int64)
+            return kind, np.concatenate(chunks)
+        data = []
+        for chunk in chunks:
+            data.extend(chunk)
+        return kind, data
+    
+    @staticmethod
+    def load_binary(filename, compact=False):
+        #(kind, data) of a binary dataset, points are a read-only numpy.memmap (zero-copy),
+        #with compact=True a PointArray whose columns are strided views of that memmap
+        kind, dtype, count = DatasetLoader.read_binary_header(filename)
+        if kind == "points" and NUMPY_AVAILABLE:
+            if count == 0:
+                points = np.empty((0, 2), dtype=dtype)
+            else:
+                points = np.memmap(filename, dtype=dtype, mode='r',
+                                   offset=DatasetLoader.BINARY_HEADER.size, shape=(count, 2))
+            return kind, PointArray(points[:, 0], points[:, 1]) if compact else points
+        if kind == "points" and compact:
+            return kind, PointArray.from_chunks(DatasetLoader.iter_binary_chunks(filename))
+        data = []
+        for chunk in DatasetLoader.iter_binary_chunks(filename):
+            data.extend(chunk)
+        return kind, data
+    
+    @staticmethod
+    def iter_binary_chunks(filename, chunk_size=None):
+        #binary counterpart of iter_chunks, chunk_size is in bytes of stored data
+        chunk_size = chunk_size or DatasetLoader.CHUNK_SIZE
+        kind, dtype, count = DatasetLoader.read_binary_header(filename)
+        if count == 0:
+            return
+        offset = DatasetLoader.BINARY_HEADER.size
+        
+        if kind == "points":
+            code = DatasetLoader.BINARY_STRUCT_CODES[dtype]
+            item = struct.calcsize(code)
+            step = max(chunk_size // (2 * item), 1)
+            if NUMPY_AVAILABLE:
+                points = np.memmap(filename, dtype=dtype, mode='r', offset=offset, shape=(count, 2))
+                for start in range(0, count, step):
+                    yield points[start:start + step]
+                return
+            with open(filename, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                for start in range(0, count, step):
+                    stop = min(start + step, count)
+                    values = struct.unpack_from(f'<{2 * (stop - start)}{code}', view, offset + start * 2 * item)
+                    yield list(zip(values[0::2], values[1::2]))
+            return
+        
+        with open(filename, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            pairs = []
+            used = 0
+            for _ in range(count):
+                pair = []
+                for _ in range(2):
+                    (limbs,) = struct.unpack_from('<q', view, offset)
+                    offset += 8
+                    nbytes = 4 * abs(limbs)
+                    value = int.from_bytes(view[offset:offset + nbytes], 'little')
+                    offset += nbytes
+                    used += nbytes + 8
+                    pair.append(-value if limbs < 0 else value)
+                pairs.append(tuple(pair))
+                if used >= chunk_size:
+                    yield pairs
+                    pairs = []
+                    used = 0
+            if pairs:
+                yield pairs
+    
+    @staticmethod
+    def binary_header(kind, dtype_code, count):
+        #packed header for a binary dataset of count points or integer pairs
+        kind_code = 1 if kind == "points" else 2
+        return DatasetLoader.BINARY_HEADER.pack(DatasetLoader.BINARY_MAGIC, DatasetLoader.BINARY_VERSION,
+                                                kind_code, dtype_code, count)
+    
+    @staticmethod
+    def pack_integer(value):
+        #one integer in the binary limb encoding: signed int64 limb count plus 32-bit limbs
+        limbs = -(-abs(value).bit_length() // 32)
+        return struct.pack('<q', -limbs if value < 0 else limbs) + abs(value).to_bytes(4 * limbs, 'little')
+    
+    @staticmethod
+    def convert_to_binary(source, target=None):
+        #writes the binary form of a .txt dataset (by default next to it as .bin)
+        #streams the text chunk by chunk and returns the target path
+        if target is None:
+            target = os.path.splitext(source)[0] + '.bin'
+        kind = DatasetLoader.detect_format(source)
+        
+        if kind == "points":
+            #one pass to pick the narrowest exact value type, from each chunk's dtype and
+            #range (a per-value loop only without numpy)
+            dtype_code = 0
+            for chunk in DatasetLoader.iter_chunks(source, kind):
+                if NUMPY_AVAILABLE:
+                    if chunk.dtype.kind == 'f':
+                        dtype_code = 2
+                    elif dtype_code == 0 and len(chunk) and (chunk.min() < -2**31 or chunk.max() >= 2**31):
+                        dtype_code = 1
+                else:
+                    for point in chunk:
+                        for value in point:
+                            if isinstance(value, float):
+                                dtype_code = 2
+                            elif dtype_code == 0 and not -2**31 <= value < 2**31:
+                                dtype_code = 1
+                if dtype_code == 2:
+                    break
+        else:
+            dtype_code = 3
+        
+        count = 0
+        with open(target, 'wb') as out:
+            out.write(b'\0' * DatasetLoader.BINARY_HEADER.size)
+            for chunk in DatasetLoader.iter_chunks(source, kind):
+                if kind == "points":
+                    dtype = DatasetLoader.BINARY_DTYPES[dtype_code]
+                    if NUMPY_AVAILABLE:
+                        out.write(np.asarray(chunk, dtype=dtype).tobytes())
+                    else:
+                        flat = [value for point in chunk for value in point]
+                        code = DatasetLoader.BINARY_STRUCT_CODES[dtype]
+                        out.write(struct.pack(f'<{len(flat)}{code}', *flat))
+                else:
+                    for pair in chunk:
+                        out.write(DatasetLoader.pack_integer(pair[0]) + DatasetLoader.pack_integer(pair[1]))
+                count += len(chunk)
+            out.seek(0)
+            out.write(DatasetLoader.binary_header(kind, dtype_code, count))
+        return target
+
+if __name__ == "__main__":
+    #converter: python loader.py datasets/*.txt
+    if len(sys.argv) < 2:
+        print("usage: python loader.py DATASET.txt [DATASET.txt ...]")
+        sys.exit(1)
+    for source in sys.argv[1:]:
+        target = DatasetLoader.convert_to_binary(source)
+        print(f"Converted {source} -> {target}")
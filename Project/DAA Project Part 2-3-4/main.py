@@ -1,10 +1,17 @@
 #DAA Project - Divide and Conquer Algorithms Analyzer
 #Group Members: Syed Ukkashah (23K-0055), Ibrahim Johar (23K-0074), Amna Asim (23K-0859)
 #BAI-5A
+#usage: python main.py [--startup-time]  (--startup-time reports startup and exits)
+
+#startup is timed from here, before the gui imports
+import time
+STARTUP_BEGIN = time.perf_counter()
 
 from gui import DivideConquerGUI
 import tkinter as tk
 import os
+import sys
+IMPORTS_DONE = time.perf_counter()
 
 def main():
     #creating datasets directory if it doesnt exist
@@ -14,6 +21,15 @@ def main():
     
     root = tk.Tk()
     app = DivideConquerGUI(root)
+    root.update_idletasks()
+    window_shown = time.perf_counter()
+    startup_ms = (window_shown - STARTUP_BEGIN) * 1000
+    print(f"Startup: {startup_ms:.0f} ms (imports {(IMPORTS_DONE - STARTUP_BEGIN) * 1000:.0f} ms, "
+          f"window {(window_shown - IMPORTS_DONE) * 1000:.0f} ms)")
+    if "--startup-time" in sys.argv[1:]:
+        root.destroy()
+        return
+    app.status_var.set(f"🟢 Ready To Analyze Algorithms (started in {startup_ms:.0f} ms)")
     
     print("=" * 60)
     print("Divide and Conquer Algorithms Application")
@@ -0,0 +1,151 @@
+from array import array
+
+#numpy is optional here, without it the columns are array('q') / array('d')
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+class PointArray:
+    #struct-of-arrays point set: one x column and one y column instead of a list of (x, y)
+    #tuples, about 16 bytes per point against 100+ for tuples of python ints
+    #columns are 1-D numpy arrays (any numeric dtype, strided memmap views included) or
+    #array('q') / array('d') without numpy, each column is int64 when every value fits,
+    #float64 otherwise
+    #points[i] and iteration build (x, y) tuples of python numbers on access only,
+    #the divide and conquer engines sort the columns into new compact columns
+    #(see x_order / take) and never build the tuples
+    
+    #points converted to tuples per block by __iter__
+    ITER_CHUNK = 1 << 16
+    
+    def __init__(self, xs, ys):
+        if len(xs) != len(ys):
+            raise ValueError("x and y columns must have the same length")
+        self.xs = xs
+        self.ys = ys
+        self.numpy = NUMPY_AVAILABLE and isinstance(xs, np.ndarray)
+    
+    @staticmethod
+    def column(values):
+        #array('q') of values when they are all ints that fit int64, array('d') otherwise
+        if all(isinstance(v, int) for v in values):
+            try:
+                return array('q', values)
+            except OverflowError:
+                raise ValueError("Integer coordinates must fit in int64 for a PointArray") from None
+        return array('d', values)
+    
+    @staticmethod
+    def from_points(points):
+        #PointArray of a list of (x, y) pairs or an (N, 2) array, copies the coordinates once
+        if isinstance(points, PointArray):
+            return points
+        if NUMPY_AVAILABLE and isinstance(points, np.ndarray):
+            if points.size == 0:
+                return PointArray(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))
+            if points.ndim != 2 or points.shape[1] != 2:
+                raise ValueError("PointArray expects an (N, 2) array of points")
+            dtype = np.int64 if points.dtype.kind in 'biu' else np.float64
+            return PointArray(np.ascontiguousarray(points[:, 0], dtype=dtype),
+                              np.ascontiguousarray(points[:, 1], dtype=dtype))
+        if not isinstance(points, (list, tuple)):
+            points = list(points)
+        xs = PointArray.column([p[0] for p in points])
+        ys = PointArray.column([p[1] for p in points])
+        if NUMPY_AVAILABLE:
+            #zero-copy numpy views, they keep the arrays alive
+            return PointArray(np.frombuffer(xs, dtype=np.int64 if xs.typecode == 'q' else np.float64),
+                              np.frombuffer(ys, dtype=np.int64 if ys.typecode == 'q' else np.float64))
+        return PointArray(xs, ys)
+    
+    @staticmethod
+    def from_chunks(chunks):
+        #PointArray of the blocks yielded by DatasetLoader.iter_chunks, converted one block
+        #at a time so the tuple or (k, 2) form of the whole dataset never exists at once
+        parts = [PointArray.from_points(chunk) for chunk in chunks]
+        if not parts:
+            return PointArray.from_points([])
+        if len(parts) == 1:
+            return parts[0]
+        if parts[0].numpy:
+            return PointArray(np.concatenate([part.xs for part in parts]),
+                              np.concatenate([part.ys for part in parts]))
+        columns = []
+        for name in ('xs', 'ys'):
+            pieces = [getattr(part, name) for part in parts]
+            typecode = 'q' if all(piece.typecode == 'q' for piece in pieces) else 'd'
+            column = array(typecode)
+            for piece in pieces:
+                column.extend(piece if piece.typecode == typecode else array(typecode, piece))
+            columns.append(column)
+        return PointArray(*columns)
+    
+    def __len__(self):
+        return len(self.xs)
+    
+    def __getitem__(self, i):
+        if self.numpy:
+            return self.xs[i].item(), self.ys[i].item()
+        return self.xs[i], self.ys[i]
+    
+    def __iter__(self):
+        for start in range(0, len(self.xs), PointArray.ITER_CHUNK):
+            stop = start + PointArray.ITER_CHUNK
+            yield from zip(self.xs[start:stop].tolist(), self.ys[start:stop].tolist())
+    
+    def __repr__(self):
+        return f"PointArray({len(self)} points, {self.nbytes} bytes)"
+    
+    @property
+    def nbytes(self):
+        if self.numpy:
+            return self.xs.nbytes + self.ys.nbytes
+        return self.xs.itemsize * len(self.xs) + self.ys.itemsize * len(self.ys)
+    
+    @property
+    def integral(self):
+        #True when both columns hold integers
+        if self.numpy:
+            return self.xs.dtype.kind in 'biu' and self.ys.dtype.kind in 'biu'
+        return self.xs.typecode == 'q' and self.ys.typecode == 'q'
+    
+    def x_order(self):
+        #permutation of point indices sorted by x, stable like sorted() on the tuples' x
+        if self.numpy:
+            return np.argsort(self.xs, kind='stable')
+        return sorted(range(len(self.xs)), key=self.xs.__getitem__)
+    
+    def take(self, order):
+        #(xs, ys) in the order of an index permutation as new array('q') / array('d')
+        #columns, 8 bytes per coordinate instead of a list of python numbers (indexing
+        #them still gives python numbers), see compact for the numpy columns
+        if self.numpy:
+            return PointArray.compact(self.xs[order]), PointArray.compact(self.ys[order])
+        xs, ys = self.xs, self.ys
+        return array(xs.typecode, (xs[i] for i in order)), array(ys.typecode, (ys[i] for i in order))
+    
+    @staticmethod
+    def compact(column):
+        #array('d') of a float numpy column, array('q') of an integer one, a list of
+        #python ints when the values may not fit int64 (uint64, object)
+        kind = column.dtype.kind
+        if kind == 'f':
+            return array('d', column.astype(np.float64, copy=False).tobytes())
+        if kind in 'bi' or (kind == 'u' and column.dtype.itemsize < 8):
+            return array('q', column.astype(np.int64, copy=False).tobytes())
+        return column.tolist()
+    
+    def tolists(self):
+        #(xs, ys) as lists of python numbers, for the pure python engines
+        return self.xs.tolist(), self.ys.tolist()
+    
+    def numpy_columns(self):
+        #(xs, ys) as numpy arrays, without copying
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for PointArray.numpy_columns")
+        if self.numpy:
+            return self.xs, self.ys
+        return (np.frombuffer(self.xs, dtype=np.int64 if self.xs.typecode == 'q' else np.float64),
+                np.frombuffer(self.ys, dtype=np.int64 if self.ys.typecode == 'q' else np.float64))
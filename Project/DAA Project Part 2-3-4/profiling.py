@@ -0,0 +1,134 @@
+#opt-in profiling of one algorithm run: cProfile for time, tracemalloc for peak memory
+#each profiled run leaves <name>_<timestamp>.prof (pstats, for snakeviz and friends),
+#.collapsed (one "frame;frame;frame microseconds" line per stack, the input of
+#flamegraph.pl / speedscope) and .json (peak memory plus the top hotspots)
+
+import cProfile
+import json
+import os
+import pstats
+import time
+import tracemalloc
+
+class RunProfiler:
+    #hotspots kept in the summary
+    TOP_N = 15
+    #deepest stack written to the collapsed output
+    MAX_STACK_DEPTH = 64
+    #call paths carrying less time than this are left out of the collapsed output
+    MIN_STACK_SECONDS = 1e-6
+    
+    @staticmethod
+    def frame_label(func):
+        #"file.py:function" for python code, the builtin's name otherwise
+        filename, line, name = func
+        if filename == '~':
+            return name
+        return f"{os.path.basename(filename)}:{name}"
+    
+    @staticmethod
+    def collapsed_stacks(stats):
+        #{"root;caller;callee": seconds of own time} rebuilt from cProfile's caller graph
+        #cProfile only keeps caller -> callee edges, so time reaching a function through
+        #several callers is split in proportion to each edge's cumulative time, and calls
+        #back into a function already on the stack (recursion) are folded into that frame
+        entries = stats.stats
+        children = {}
+        for func, (_, _, _, _, callers) in entries.items():
+            for caller, edge in callers.items():
+                children.setdefault(caller, {})[func] = edge
+        stacks = {}
+    
+        def walk(func, path, on_path, own, cumulative):
+            label = RunProfiler.frame_label(func)
+            path = path + (label,)
+            total = entries[func][3]
+            scale = cumulative / total if total else 0.0
+            for child, edge in children.get(func, {}).items():
+                if child in on_path or child == func:
+                    own += edge[2] * scale
+            key = ";".join(path)
+            stacks[key] = stacks.get(key, 0.0) + own
+            if len(path) >= RunProfiler.MAX_STACK_DEPTH:
+                return
+            for child, edge in children.get(func, {}).items():
+                if child in on_path or child == func or edge[3] * scale < RunProfiler.MIN_STACK_SECONDS:
+                    continue
+                walk(child, path, on_path | {func}, edge[2] * scale, edge[3] * scale)
+        
+        for func, (_, _, own, cumulative, callers) in entries.items():
+            if not callers:
+                walk(func, (), frozenset(), own, cumulative)
+        return stacks
+    
+    @staticmethod
+    def hotspots(stats, top_n=None):
+        #[{"function", "calls", "own", "cumulative"}, ...] sorted by own time
+        top_n = top_n or RunProfiler.TOP_N
+        rows = []
+        for func, (_, calls, own, cumulative, _) in stats.stats.items():
+            rows.append({"function": RunProfiler.frame_label(func), "calls": calls,
+                         "own": own, "cumulative": cumulative})
+        rows.sort(key=lambda row: row["own"], reverse=True)
+        return rows[:top_n]
+    
+    @staticmethod
+    def profile_call(func, *args, name="run", output_dir=None, **kwargs):
+        #runs func(*args, **kwargs) under cProfile and tracemalloc, returns (result, summary)
+        #summary has seconds (profiled, so slower than a plain run), peak_bytes,
+        #hotspots and, when output_dir is given, the paths of the files written
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        profiler = cProfile.Profile()
+        start_time = time.perf_counter()
+        try:
+            result = profiler.runcall(func, *args, **kwargs)
+        finally:
+            seconds = time.perf_counter() - start_time
+            current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+            if not was_tracing:
+                tracemalloc.stop()
+        
+        stats = pstats.Stats(profiler)
+        summary = {
+            "name": name,
+            "seconds": seconds,
+            "peak_bytes": peak_bytes,
+            "retained_bytes": current_bytes,
+            "hotspots": RunProfiler.hotspots(stats),
+        }
+        if output_dir:
+            summary["files"] = RunProfiler.save(stats, summary, name, output_dir)
+        return result, summary
+    
+    @staticmethod
+    def save(stats, summary, name, output_dir):
+        #writes the .prof / .collapsed / .json files of one run, returns their paths
+        os.makedirs(output_dir, exist_ok=True)
+        base = os.path.join(output_dir, f"{name}_{time.strftime('%Y%m%dT%H%M%S')}")
+        paths = {"pstats": base + ".prof", "collapsed": base + ".collapsed", "summary": base + ".json"}
+        stats.dump_stats(paths["pstats"])
+        with open(paths["collapsed"], 'w') as f:
+            for stack, seconds in sorted(RunProfiler.collapsed_stacks(stats).items()):
+                micros = round(seconds * 1e6)
+                if micros > 0:
+                    f.write(f"{stack} {micros}\n")
+        with open(paths["summary"], 'w') as f:
+            json.dump(dict(summary, files=paths), f, indent=2)
+        return paths
+    
+    @staticmethod
+    def format_summary(summary):
+        #text block for the results tab
+        lines = [f"🔬 Profile of {summary['name']} (cProfile + tracemalloc, slower than a plain run):",
+                 f"   • Profiled time: {summary['seconds']:.6f} seconds",
+                 f"   • Peak traced memory: {summary['peak_bytes'] / 1024:.1f} KiB "
+                 f"(retained after the run: {summary['retained_bytes'] / 1024:.1f} KiB)",
+                 f"   • Top {len(summary['hotspots'])} hotspots by own time (calls / own / cumulative):"]
+        for row in summary["hotspots"]:
+            lines.append(f"     {row['function'][:48]:48s} {row['calls']:9d} {row['own']:9.4f}s {row['cumulative']:9.4f}s")
+        for kind, path in summary.get("files", {}).items():
+            lines.append(f"   • {kind}: {path}")
+        return "\n".join(lines)
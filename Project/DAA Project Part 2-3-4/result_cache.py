@@ -0,0 +1,142 @@
+#content-addressed cache of GUI runs, so re-opening a dataset skips the recomputation
+#usage: python result_cache.py info|clear [--db result_cache.db]
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+
+class ResultCache:
+    DEFAULT_PATH = "result_cache.db"
+    #entries are evicted least recently used first once payloads and images exceed this
+    DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+    #bump when the payload layout changes, invalidates every entry like a code change does
+    FORMAT_VERSION = 2
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS entries (
+            key TEXT PRIMARY KEY,
+            dataset_hash TEXT NOT NULL,
+            algorithm TEXT NOT NULL,
+            engine TEXT NOT NULL,
+            code_version TEXT NOT NULL,
+            created TEXT NOT NULL,
+            last_used REAL NOT NULL,
+            size INTEGER NOT NULL,
+            payload TEXT NOT NULL,
+            image BLOB
+        );
+        CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used);
+    """
+    
+    def __init__(self, path=None, max_bytes=None, sources=None):
+        #sources: files hashed into the code version (default: default_sources())
+        self.path = path or ResultCache.DEFAULT_PATH
+        self.max_bytes = ResultCache.DEFAULT_MAX_BYTES if max_bytes is None else max_bytes
+        if sources is None:
+            sources = ResultCache.default_sources()
+        self.code_version = ResultCache.source_version(sources)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.executescript(ResultCache.SCHEMA)
+        self.purge_stale()
+    
+    def close(self):
+        self.connection.close()
+    
+    @staticmethod
+    def default_sources():
+        #every module of this folder, so a change anywhere on the run path (algorithms,
+        #point_array, loader, jobs, instrumentation, the GUI, ...) gives a new code version
+        #test files are left out, they never run in the GUI
+        here = os.path.dirname(os.path.abspath(__file__))
+        return [os.path.join(here, name) for name in sorted(os.listdir(here))
+                if name.endswith(".py") and not name.startswith("test_")]
+    
+    @staticmethod
+    def source_version(sources):
+        #sha256 over the format version and the content of every source file, so any
+        #edit to the algorithm code gives new keys
+        digest = hashlib.sha256(f"format:{ResultCache.FORMAT_VERSION}".encode())
+        for filename in sources:
+            with open(filename, 'rb') as f:
+                digest.update(os.path.basename(filename).encode() + b'\0' + f.read())
+        return digest.hexdigest()[:16]
+    
+    def key(self, dataset_hash, algorithm, engine):
+        return hashlib.sha256(f"{dataset_hash}|{algorithm}|{engine}|{self.code_version}".encode()).hexdigest()
+    
+    def purge_stale(self):
+        #drops entries written by another version of the code, they can never be hit again
+        self.connection.execute("DELETE FROM entries WHERE code_version != ?", (self.code_version,))
+        self.connection.commit()
+    
+    def get(self, dataset_hash, algorithm, engine):
+        #{"payload", "image", "created"} of a cached run, None on a miss
+        key = self.key(dataset_hash, algorithm, engine)
+        row = self.connection.execute("SELECT payload, image, created FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        self.connection.execute("UPDATE entries SET last_used = ? WHERE key = ?", (time.time(), key))
+        self.connection.commit()
+        payload, image, created = row
+        return {"payload": json.loads(payload), "image": image, "created": created}
+    
+    def put(self, dataset_hash, algorithm, engine, payload, image=None):
+        #stores one run (payload must be JSON serializable, image is e.g. PNG bytes),
+        #replacing any entry with the same key, then evicts down to max_bytes
+        text = json.dumps(payload)
+        size = len(text) + (len(image) if image else 0)
+        if size > self.max_bytes:
+            return False
+        self.connection.execute(
+            "INSERT OR REPLACE INTO entries (key, dataset_hash, algorithm, engine, code_version, created, "
+            "last_used, size, payload, image) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (self.key(dataset_hash, algorithm, engine), dataset_hash, algorithm, engine, self.code_version,
+             time.strftime("%Y-%m-%dT%H:%M:%S"), time.time(), size, text,
+             None if image is None else sqlite3.Binary(image)))
+        self.evict()
+        self.connection.commit()
+        return True
+    
+    def evict(self):
+        #deletes least recently used entries until the total size fits in max_bytes
+        total = 0
+        stale = []
+        for key, size in self.connection.execute("SELECT key, size FROM entries ORDER BY last_used DESC"):
+            total += size
+            if total > self.max_bytes:
+                stale.append((key,))
+        self.connection.executemany("DELETE FROM entries WHERE key = ?", stale)
+        return len(stale)
+    
+    def info(self):
+        #(entries, total bytes)
+        count, total = self.connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return count, total
+    
+    def clear(self):
+        self.connection.execute("DELETE FROM entries")
+        self.connection.commit()
+        self.connection.execute("VACUUM")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cache of GUI algorithm runs")
+    parser.add_argument("command", choices=["info", "clear"])
+    parser.add_argument("--db", default=ResultCache.DEFAULT_PATH)
+    args = parser.parse_args(argv)
+    
+    cache = ResultCache(args.db)
+    try:
+        if args.command == "clear":
+            cache.clear()
+        count, total = cache.info()
+        print(f"{count} cached runs, {total / (1024 * 1024):.1f} MiB (code version {cache.code_version})")
+    finally:
+        cache.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
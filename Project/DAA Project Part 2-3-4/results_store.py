@@ -0,0 +1,207 @@
+#persistent store of benchmark timings plus a regression gate over it
+#usage: python results_store.py compare --db results.db [--threshold 0.05]
+
+import argparse
+import hashlib
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import time
+
+class ResultsStore:
+    DEFAULT_PATH = "results.db"
+    #bootstrap resamples and confidence level used by compare()
+    BOOTSTRAP_SAMPLES = 2000
+    CONFIDENCE = 0.95
+    #slowdowns smaller than this fraction are never flagged
+    DEFAULT_THRESHOLD = 0.05
+    #runs with fewer repeats than this are left out of compare(), one timing is too noisy
+    #to flag or clear a regression on its own
+    MIN_SAMPLES = 3
+    #runs only compare with runs of the same configuration: worker count and the data
+    #representation the engine was fed ("list", "PointArray", "ndarray")
+    DEFAULT_REPRESENTATION = "list"
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TEXT NOT NULL,
+            algorithm TEXT NOT NULL,
+            engine TEXT NOT NULL,
+            dataset_hash TEXT NOT NULL,
+            dataset_name TEXT,
+            machine TEXT NOT NULL,
+            size INTEGER,
+            times TEXT NOT NULL,
+            correct INTEGER,
+            workers INTEGER NOT NULL DEFAULT 1,
+            representation TEXT NOT NULL DEFAULT 'list'
+        );
+    """
+    #columns added after the first schema, older databases get them with their defaults
+    ADDED_COLUMNS = {
+        "workers": "INTEGER NOT NULL DEFAULT 1",
+        "representation": "TEXT NOT NULL DEFAULT 'list'",
+    }
+    INDEX = """
+        DROP INDEX IF EXISTS runs_key;
+        CREATE INDEX IF NOT EXISTS runs_config_key
+            ON runs (algorithm, engine, dataset_hash, machine, workers, representation);
+    """
+    
+    def __init__(self, path=None):
+        self.path = path or ResultsStore.DEFAULT_PATH
+        self.connection = sqlite3.connect(self.path)
+        self.connection.executescript(ResultsStore.SCHEMA)
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(runs)")}
+        for name, definition in ResultsStore.ADDED_COLUMNS.items():
+            if name not in columns:
+                self.connection.execute(f"ALTER TABLE runs ADD COLUMN {name} {definition}")
+        self.connection.executescript(ResultsStore.INDEX)
+    
+    def close(self):
+        self.connection.close()
+    
+    @staticmethod
+    def dataset_hash(filename, chunk_size=1 << 20):
+        #sha256 of the file content, so renamed or copied datasets keep their history
+        digest = hashlib.sha256()
+        with open(filename, 'rb') as f:
+            for block in iter(lambda: f.read(chunk_size), b''):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    @staticmethod
+    def machine_fingerprint():
+        #short stable id of the host and interpreter the timings came from
+        parts = [platform.node(), platform.machine(), platform.processor(), platform.system(),
+                 platform.python_implementation(), platform.python_version(), str(os.cpu_count())]
+        return hashlib.sha256("|".join(parts).encode()).hexdigest()[:16]
+    
+    def record(self, algorithm, engine, dataset_hash, times, dataset_name=None, size=None,
+               correct=None, machine=None, workers=1, representation=None):
+        #stores one run (a list of per-repeat seconds), returns its row id
+        cursor = self.connection.execute(
+            "INSERT INTO runs (timestamp, algorithm, engine, dataset_hash, dataset_name, machine, size, times, "
+            "correct, workers, representation) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (time.strftime("%Y-%m-%dT%H:%M:%S"), algorithm, engine, dataset_hash, dataset_name,
+             machine or ResultsStore.machine_fingerprint(), size, json.dumps(list(times)),
+             None if correct is None else int(bool(correct)), workers,
+             representation or ResultsStore.DEFAULT_REPRESENTATION))
+        self.connection.commit()
+        return cursor.lastrowid
+    
+    def record_benchmark(self, records):
+        #stores the records produced by BenchmarkRunner.run_dataset
+        hashes = {}
+        for record in records:
+            name = record["dataset"]
+            if name not in hashes:
+                hashes[name] = ResultsStore.dataset_hash(name)
+            self.record(record["algorithm"], record["engine"], hashes[name], record["times"],
+                        os.path.basename(name), record["size"], record["correct"],
+                        workers=record["workers"], representation=record["representation"])
+    
+    def history(self, algorithm, engine, dataset_hash, machine=None, workers=1, representation=None):
+        #[(timestamp, times), ...] oldest first for one key
+        rows = self.connection.execute(
+            "SELECT timestamp, times FROM runs WHERE algorithm = ? AND engine = ? AND dataset_hash = ? "
+            "AND machine = ? AND workers = ? AND representation = ? ORDER BY id",
+            (algorithm, engine, dataset_hash, machine or ResultsStore.machine_fingerprint(), workers,
+             representation or ResultsStore.DEFAULT_REPRESENTATION))
+        return [(timestamp, json.loads(times)) for timestamp, times in rows]
+    
+    def keys(self, machine=None):
+        #every (algorithm, engine, dataset_hash, workers, representation, dataset_name)
+        #with runs on this machine
+        rows = self.connection.execute(
+            "SELECT algorithm, engine, dataset_hash, workers, representation, MAX(dataset_name) FROM runs "
+            "WHERE machine = ? GROUP BY algorithm, engine, dataset_hash, workers, representation "
+            "ORDER BY algorithm, engine, MAX(dataset_name), workers, representation",
+            (machine or ResultsStore.machine_fingerprint(),))
+        return rows.fetchall()
+    
+    @staticmethod
+    def bootstrap_ratio(baseline, candidate, samples=None, confidence=None, seed=0):
+        #(point, low, high) of median(candidate) / median(baseline) with a percentile
+        #bootstrap confidence interval, resampling each list of repeats with replacement
+        samples = samples or ResultsStore.BOOTSTRAP_SAMPLES
+        confidence = confidence or ResultsStore.CONFIDENCE
+        rng = random.Random(seed)
+        point = statistics.median(candidate) / statistics.median(baseline)
+        ratios = []
+        for _ in range(samples):
+            base = statistics.median(rng.choices(baseline, k=len(baseline)))
+            cand = statistics.median(rng.choices(candidate, k=len(candidate)))
+            ratios.append(cand / base)
+        ratios.sort()
+        tail = (1 - confidence) / 2
+        low = ratios[int(tail * (samples - 1))]
+        high = ratios[int((1 - tail) * (samples - 1))]
+        return point, low, high
+    
+    def compare(self, threshold=None, machine=None, min_samples=None):
+        #latest run of every key against the run before it, returns a list of dicts
+        #only runs with at least min_samples repeats take part
+        #"regression" is True when the whole confidence interval is above 1 + threshold
+        threshold = ResultsStore.DEFAULT_THRESHOLD if threshold is None else threshold
+        min_samples = ResultsStore.MIN_SAMPLES if min_samples is None else min_samples
+        report = []
+        for algorithm, engine, dataset_hash, workers, representation, dataset_name in self.keys(machine):
+            runs = [run for run in self.history(algorithm, engine, dataset_hash, machine, workers, representation)
+                    if len(run[1]) >= min_samples]
+            if len(runs) < 2:
+                continue
+            (base_time, baseline), (cand_time, candidate) = runs[-2], runs[-1]
+            point, low, high = ResultsStore.bootstrap_ratio(baseline, candidate)
+            report.append({
+                "algorithm": algorithm,
+                "engine": engine,
+                "dataset": dataset_name,
+                "dataset_hash": dataset_hash,
+                "workers": workers,
+                "representation": representation,
+                "baseline": base_time,
+                "candidate": cand_time,
+                "ratio": point,
+                "low": low,
+                "high": high,
+                "regression": low > 1 + threshold,
+                "improvement": high < 1 - threshold,
+            })
+        return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark results store and regression gate")
+    sub = parser.add_subparsers(dest="command", required=True)
+    compare = sub.add_parser("compare", help="compare the latest run of every benchmark with the previous one")
+    compare.add_argument("--db", default=ResultsStore.DEFAULT_PATH)
+    compare.add_argument("--threshold", type=float, default=ResultsStore.DEFAULT_THRESHOLD,
+                         help="smallest slowdown (fraction) that can be flagged")
+    compare.add_argument("--min-samples", type=int, default=ResultsStore.MIN_SAMPLES,
+                         help="leave out runs with fewer timed repeats than this")
+    compare.add_argument("--json", action="store_true", help="print the comparison as JSON")
+    args = parser.parse_args(argv)
+    
+    store = ResultsStore(args.db)
+    try:
+        report = store.compare(args.threshold, min_samples=args.min_samples)
+    finally:
+        store.close()
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for row in report:
+            flag = "REGRESSION" if row["regression"] else ("faster" if row["improvement"] else "ok")
+            print(f"{row['algorithm']:13s} {row['engine']:18s} {str(row['dataset']):32s} "
+                  f"w{row['workers']:<3d} {row['representation']:10s} x{row['ratio']:.3f} [{row['low']:.3f}, {row['high']:.3f}] {flag}")
+        if not report:
+            print(f"No benchmark has two runs of at least {args.min_samples} repeats on this machine yet")
+    return 1 if any(row["regression"] for row in report) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,239 @@
+#scaling benchmark suite: sweeps input sizes geometrically for every engine, fits the
+#timings to a * n^k * log(n)^j and reports exponents and crossover points
+#usage: python scaling.py --problem closest_pair --max-size 1000000 --output benchmarks/
+
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+from array import array
+
+from algorithms import DivideConquerAlgorithms
+from benchmark import BenchmarkRunner
+from generator import InputGenerator, NUMPY_AVAILABLE
+from point_array import PointArray
+
+class ScalingBenchmark:
+    #sweep ranges: points per dataset and digits per operand
+    POINT_RANGE = (10**2, 10**7)
+    DIGIT_RANGE = (10, 10**6)
+    #sizes tried per factor of ten
+    STEPS_PER_DECADE = 2
+    #largest size each slow engine is swept to (karatsuba is also capped by
+    #CPython's 4300 digit int/str conversion limit)
+    ENGINE_LIMITS = {
+        "brute_force": 3000,
+        "karatsuba": 4000,
+        "naive": 100000,
+        "schoolbook": 100000,
+    }
+    #exponents of log n tried by fit_complexity, a higher one has to cut the
+    #fit error by LOG_POWER_GAIN to be chosen (n^k and log factors are nearly collinear)
+    LOG_POWERS = (0, 1, 2)
+    LOG_POWER_GAIN = 0.8
+    #timings below this are mostly call overhead and are left out of fits
+    MIN_FIT_SECONDS = 1e-4
+    #engines closer than this ratio at both ends of an interval are not a crossover
+    CROSSOVER_MARGIN = 1.2
+    
+    @staticmethod
+    def geometric_sizes(start, stop, steps_per_decade=None):
+        #start, start * 10^(1/steps), ... up to stop, as distinct ints
+        steps_per_decade = steps_per_decade or ScalingBenchmark.STEPS_PER_DECADE
+        sizes = []
+        exponent = math.log10(start)
+        while True:
+            size = int(round(10 ** exponent))
+            if size > stop:
+                break
+            if not sizes or size != sizes[-1]:
+                sizes.append(size)
+            exponent += 1 / steps_per_decade
+        return sizes
+    
+    @staticmethod
+    def engines(problem):
+        #every concrete engine for a problem ("auto" only picks one of them)
+        if problem == "closest_pair":
+            return [s for s in DivideConquerAlgorithms.CLOSEST_PAIR_STRATEGIES if s != "auto"]
+        return [m for m in DivideConquerAlgorithms.MULTIPLY_METHODS if m != "auto"]
+    
+    @staticmethod
+    def make_input(problem, n, rng):
+        #n random points on a grid that grows with n, or two random ~n-digit operands
+        #points come as a PointArray, generated in numpy blocks (16 bytes per point instead
+        #of a list of tuples, which would not fit in memory at the top of POINT_RANGE)
+        if problem == "closest_pair":
+            span = 10 * n
+            if NUMPY_AVAILABLE:
+                blocks = InputGenerator.point_blocks(n, "uniform", max_val=span, seed=rng.getrandbits(63))
+                return PointArray.from_chunks(blocks)
+            return PointArray(array('q', (rng.randint(0, span) for _ in range(n))),
+                              array('q', (rng.randint(0, span) for _ in range(n))))
+        bits = max(int(n * math.log2(10)), 1)
+        top = 1 << (bits - 1)
+        return (rng.getrandbits(bits) | top, rng.getrandbits(bits) | top)
+    
+    @staticmethod
+    def make_job(problem, engine, data):
+        if problem == "closest_pair":
+            return lambda: DivideConquerAlgorithms.closest_pair(data, strategy=engine)
+        multiply = DivideConquerAlgorithms.get_multiplier(engine)
+        x, y = data
+        return lambda: multiply(x, y)
+    
+    @staticmethod
+    def sweep(problem, engines, sizes, repeat=3, max_seconds=10.0, seed=0, progress=None):
+        #{engine: [(n, best seconds), ...]}, an engine stops growing once one run
+        #takes longer than max_seconds or it reaches its ENGINE_LIMITS size
+        series = {engine: [] for engine in engines}
+        active = set(engines)
+        for n in sizes:
+            data = ScalingBenchmark.make_input(problem, n, random.Random(seed + n))
+            for engine in engines:
+                if engine not in active:
+                    continue
+                if n > ScalingBenchmark.ENGINE_LIMITS.get(engine, float('inf')):
+                    active.discard(engine)
+                    continue
+                job = ScalingBenchmark.make_job(problem, engine, data)
+                _, times = BenchmarkRunner.time_call(job, warmup=0 if n > 10**5 else 1, repeat=repeat)
+                best = min(times)
+                series[engine].append((n, best))
+                if progress:
+                    progress(engine, n, best)
+                if best > max_seconds:
+                    active.discard(engine)
+            if not active:
+                break
+        return series
+    
+    @staticmethod
+    def fit_complexity(samples):
+        #least squares fit of t = a * n^k * ln(n)^j in log space, j tried from LOG_POWERS
+        #returns {"a", "k", "j", "rmse"} for the best j, or None with fewer than 3 samples
+        samples = [(n, t) for n, t in samples if n > 2 and t > 0]
+        timed = [(n, t) for n, t in samples if t >= ScalingBenchmark.MIN_FIT_SECONDS]
+        if len(timed) >= 3:
+            samples = timed
+        if len(samples) < 3:
+            return None
+        best = None
+        for j in ScalingBenchmark.LOG_POWERS:
+            xs = [math.log(n) for n, _ in samples]
+            ys = [math.log(t) - j * math.log(math.log(n)) for n, t in samples]
+            mean_x = sum(xs) / len(xs)
+            mean_y = sum(ys) / len(ys)
+            sxx = sum((x - mean_x) ** 2 for x in xs)
+            if sxx == 0:
+                return None
+            k = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / sxx
+            log_a = mean_y - k * mean_x
+            rmse = math.sqrt(sum((y - log_a - k * x) ** 2 for x, y in zip(xs, ys)) / len(xs))
+            if best is None or rmse < ScalingBenchmark.LOG_POWER_GAIN * best["rmse"]:
+                best = {"a": math.exp(log_a), "k": k, "j": j, "rmse": rmse}
+        return best
+    
+    @staticmethod
+    def crossovers(series):
+        #sizes where one engine overtakes another, interpolated in log-log space
+        #returns [{"faster": engine, "slower": engine, "n": size}, ...]
+        found = []
+        names = sorted(series)
+        for a_index, a in enumerate(names):
+            for b in names[a_index + 1:]:
+                times_b = dict(series[b])
+                shared = [(n, t, times_b[n]) for n, t in series[a] if n in times_b]
+                for (n0, a0, b0), (n1, a1, b1) in zip(shared, shared[1:]):
+                    r0 = math.log(a0 / b0)
+                    r1 = math.log(a1 / b1)
+                    if r0 == 0 or r0 * r1 >= 0:
+                        continue
+                    if max(abs(r0), abs(r1)) < math.log(ScalingBenchmark.CROSSOVER_MARGIN):
+                        continue
+                    #ratio crosses 1 between n0 and n1
+                    frac = r0 / (r0 - r1)
+                    n = math.exp(math.log(n0) + frac * (math.log(n1) - math.log(n0)))
+                    faster, slower = (a, b) if r1 < 0 else (b, a)
+                    found.append({"faster": faster, "slower": slower, "n": round(n)})
+        return found
+    
+    @staticmethod
+    def run(problem, max_size=None, engines=None, repeat=3, max_seconds=10.0, seed=0, progress=None):
+        #full report: sweep samples, fitted exponents and crossovers, with host metadata
+        low, high = ScalingBenchmark.POINT_RANGE if problem == "closest_pair" else ScalingBenchmark.DIGIT_RANGE
+        sizes = ScalingBenchmark.geometric_sizes(low, min(max_size or high, high))
+        engines = engines or ScalingBenchmark.engines(problem)
+        series = ScalingBenchmark.sweep(problem, engines, sizes, repeat, max_seconds, seed, progress)
+        return {
+            "problem": problem,
+            "size_unit": "points" if problem == "closest_pair" else "digits",
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "host": {"platform": platform.platform(), "python": platform.python_version(),
+                     "machine": platform.machine()},
+            "repeat": repeat,
+            "seed": seed,
+            "series": {engine: [[n, t] for n, t in samples] for engine, samples in series.items()},
+            "fits": {engine: ScalingBenchmark.fit_complexity(samples) for engine, samples in series.items()},
+            "crossovers": ScalingBenchmark.crossovers(series),
+        }
+    
+    @staticmethod
+    def save(report, directory):
+        #writes the report as scaling_<problem>_<timestamp>.json, returns the path
+        os.makedirs(directory, exist_ok=True)
+        stamp = report["timestamp"].replace(":", "").replace("-", "")
+        path = os.path.join(directory, f"scaling_{report['problem']}_{stamp}.json")
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+        return path
+    
+    @staticmethod
+    def format_report(report, previous=None):
+        #human readable summary, with exponent changes against an earlier report
+        lines = [f"Scaling of {report['problem']} ({report['size_unit']}):"]
+        for engine, fit in report["fits"].items():
+            if fit is None:
+                lines.append(f"  {engine:18s} not enough samples")
+                continue
+            line = f"  {engine:18s} t ~ {fit['a']:.3g} * n^{fit['k']:.3f}"
+            if fit["j"]:
+                line += f" * log(n)^{fit['j']}"
+            line += f"  (rmse {fit['rmse']:.3f})"
+            old = previous["fits"].get(engine) if previous else None
+            if old:
+                line += f"  [was n^{old['k']:.3f}, {report['fits'][engine]['k'] - old['k']:+.3f}]"
+            lines.append(line)
+        for crossing in report["crossovers"]:
+            lines.append(f"  {crossing['faster']} overtakes {crossing['slower']} at n ~ {crossing['n']}")
+        return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep input sizes and fit empirical complexity")
+    parser.add_argument("--problem", choices=["closest_pair", "multiply"], default="closest_pair")
+    parser.add_argument("--engine", action="append", dest="engines", help="engine to sweep, repeatable (default: all)")
+    parser.add_argument("--max-size", type=float, help="largest size to try (points or digits)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per size, the minimum is kept")
+    parser.add_argument("--max-seconds", type=float, default=10.0, help="stop growing an engine after a run this slow")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmarks", help="directory for the saved report")
+    parser.add_argument("--compare", help="earlier report to compare exponents against")
+    args = parser.parse_args(argv)
+    
+    progress = lambda engine, n, seconds: print(f"  {engine:18s} n={n:<10d} {seconds:.6f}s", flush=True)
+    report = ScalingBenchmark.run(args.problem, int(args.max_size) if args.max_size else None, args.engines,
+                                  args.repeat, args.max_seconds, args.seed, progress)
+    previous = None
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+    print(ScalingBenchmark.format_report(report, previous))
+    print(f"Saved {ScalingBenchmark.save(report, args.output)}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
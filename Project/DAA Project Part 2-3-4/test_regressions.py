@@ -0,0 +1,65 @@
+#regression cases for bugs found in review, run with: python -m pytest -q
+import math
+import random
+
+import pytest
+
+from algorithms import DivideConquerAlgorithms, NUMPY_AVAILABLE
+
+needs_numpy = pytest.mark.skipif(not NUMPY_AVAILABLE, reason="numpy is not installed")
+
+def wide_points(span, n=1500, seed=0):
+    #n random integer points spread over [0, span) on both axes, plus one planted close pair
+    rng = random.Random(seed)
+    points = [(rng.randrange(span), rng.randrange(span)) for _ in range(n)]
+    x, y = points[0]
+    points.append((x + 3, y + 4))
+    return points
+
+@needs_numpy
+@pytest.mark.parametrize("span", [1 << 31, 1 << 33, 1 << 40])
+@pytest.mark.parametrize("strategy", ["auto", "numpy"])
+def test_closest_pair_wide_integer_span(span, strategy):
+    #squared distances of these spans overflow int64, the numpy engine must not be used
+    import numpy as np
+    points = wide_points(span)
+    expected, _ = DivideConquerAlgorithms.closest_pair_brute_force(points)
+    for data in (points, np.array(points, dtype=np.int64)):
+        dist, pair = DivideConquerAlgorithms.closest_pair(data, strategy=strategy)
+        assert dist == expected
+        assert math.dist(*pair) == expected
+
+@needs_numpy
+def test_closest_pair_object_array():
+    #coordinates beyond int64 arrive as an object array
+    import numpy as np
+    points = [(x << 70, y) for x, y in wide_points(1 << 20)]
+    expected, _ = DivideConquerAlgorithms.closest_pair_brute_force(points)
+    dist, _ = DivideConquerAlgorithms.closest_pair(np.array(points, dtype=object), strategy="numpy")
+    assert dist == expected
+
+@pytest.mark.parametrize("kind", ["points", "integers"])
+def test_loader_rejects_short_and_long_rows(tmp_path, kind):
+    #a malformed line past the sniffed ones must not be flattened into the wrong pairs
+    rows = [f"{i},{i + 1}" for i in range(100)]
+    path = tmp_path / "data.txt"
+    path.write_text("\n".join(rows + ["3,4,5", "6"] + rows) + "\n")
+    from loader import DatasetLoader
+    with pytest.raises(ValueError):
+        DatasetLoader.load(str(path), kind=kind)
+
+def test_dynamic_pairs_packed_inserts_stay_bounded():
+    #points packed far closer than the grid scale must trigger a rebuild, not pile up
+    from dynamic_pairs import DynamicClosestPair
+    rng = random.Random(7)
+    base = [(rng.randrange(10**6), rng.randrange(10**6)) for _ in range(2000)]
+    structure = DynamicClosestPair(base)
+    packed = {(500000 + rng.randrange(40), 500000 + rng.randrange(40)) for _ in range(800)}
+    peak = 0
+    for point in packed:
+        structure.insert(point)
+        peak = max(peak, len(structure.heap))
+    n = len(set(base) | packed)
+    assert peak <= 2 * n * n.bit_length()
+    expected, _ = DivideConquerAlgorithms.closest_pair(list(set(base) | packed))
+    assert structure.closest_pair()[0] == expected